@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Add last reply and last activity columns to `request_metadata`."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = "1792317600"
+down_revision = "3ca07f2ee12b"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "request_metadata",
+        sa.Column(
+            "last_reply_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=True
+        ),
+    )
+    op.add_column(
+        "request_metadata",
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(timezone=True).with_variant(mysql.DATETIME(fsp=6), "mysql"),
+            nullable=True,
+        ),
+    )
+
+    # Backfill the columns from the existing comment events
+    op.execute("""
+        UPDATE request_metadata SET
+            last_reply_id = (
+                SELECT e.id FROM request_events e
+                WHERE e.request_id = request_metadata.id AND e.type = 'C'
+                ORDER BY e.created DESC LIMIT 1
+            ),
+            last_activity_at = (
+                SELECT e.created FROM request_events e
+                WHERE e.request_id = request_metadata.id AND e.type = 'C'
+                ORDER BY e.created DESC LIMIT 1
+            )
+        """)
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("request_metadata", "last_activity_at")
+    op.drop_column("request_metadata", "last_reply_id")
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Create `request_participants` table."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792404000"
+down_revision = "1792317600"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database.
+
+    Note: the participants of the existing requests are backfilled by the
+    ``invenio requests backfill-participants`` command (or the
+    ``backfill_participants`` task), once the mapping of the requests index is
+    updated (``invenio index update requests-request-v1.0.0``).
+    """
+    op.create_table(
+        "request_participants",
+        sa.Column("request_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=False),
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["request_id"],
+            ["request_metadata.id"],
+            name=op.f("fk_request_participants_request_id_request_metadata"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "request_id", "user_id", name=op.f("pk_request_participants")
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("request_participants")
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Create `request_pending_notifications` table."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = "1792490400"
+down_revision = "1792404000"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "request_pending_notifications",
+        sa.Column("event_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=False),
+        sa.Column("request_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=False),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created",
+            sa.DateTime(timezone=True).with_variant(mysql.DATETIME(fsp=6), "mysql"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["request_events.id"],
+            name=op.f("fk_request_pending_notifications_event_id_request_events"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["request_id"],
+            ["request_metadata.id"],
+            name=op.f("fk_request_pending_notifications_request_id_request_metadata"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "event_id", name=op.f("pk_request_pending_notifications")
+        ),
+    )
+    op.create_index(
+        op.f("ix_request_pending_notifications_key"),
+        "request_pending_notifications",
+        ["key"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_request_pending_notifications_request_id"),
+        "request_pending_notifications",
+        ["request_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_request_pending_notifications_request_id"),
+        table_name="request_pending_notifications",
+    )
+    op.drop_index(
+        op.f("ix_request_pending_notifications_key"),
+        table_name="request_pending_notifications",
+    )
+    op.drop_table("request_pending_notifications")
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Request-scoped caches."""
+
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, has_app_context
+
+
+class RequestScopedCache:
+    """Cache scoped to the current application context.
+
+    The entries live as long as the application context, i.e. the HTTP request
+    or the Celery task. Optionally, the cache is bounded (least recently used
+    entries are evicted first) and its entries expire after a time-to-live, for
+    long-running tasks (e.g. reindexing all requests).
+
+    Outside of an application context, nothing is cached.
+    """
+
+    def __init__(self, name, maxsize=None, ttl=None):
+        """Constructor.
+
+        :param name: Unique name of the cache.
+        :param maxsize: Maximum number of entries, or name of the config
+                        variable holding it (``None`` for unbounded).
+        :param ttl: Time-to-live of the entries in seconds, or name of the config
+                    variable holding it (``None`` for no expiration).
+        """
+        self.name = name
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+    def _config(self, value):
+        """Get a value which can be set in the config."""
+        if isinstance(value, str):
+            return current_app.config.get(value)
+        return value
+
+    @property
+    def _store(self):
+        """The entries and statistics of the current application context."""
+        attr = f"_requests_cache_{self.name}"
+        store = g.get(attr)
+        if store is None:
+            store = {"entries": OrderedDict(), "hits": 0, "misses": 0}
+            setattr(g, attr, store)
+        return store
+
+    def _lookup(self, store, key, now):
+        """Look up a live entry, counting the hit or miss."""
+        entry = store["entries"].get(key)
+        ttl = self._config(self._ttl)
+        if entry is not None and (ttl is None or now - entry[1] < ttl):
+            store["entries"].move_to_end(key)
+            store["hits"] += 1
+            return entry
+        store["misses"] += 1
+        return None
+
+    def _add(self, store, key, value, now):
+        """Add an entry, evicting the least recently used ones."""
+        entries = store["entries"]
+        entries[key] = (value, now)
+        entries.move_to_end(key)
+
+        maxsize = self._config(self._maxsize)
+        if maxsize is not None:
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+
+    def get(self, key, factory):
+        """Get the value for the key, computing it with ``factory`` if missing."""
+        if not has_app_context():
+            return factory()
+
+        store = self._store
+        now = time.monotonic()
+        entry = self._lookup(store, key, now)
+        if entry is not None:
+            return entry[0]
+
+        value = factory()
+        self._add(store, key, value, now)
+        return value
+
+    def get_many(self, keys, factory):
+        """Get the values for the keys, computing the missing ones in one go.
+
+        :param factory: Callable taking the list of missing keys and returning
+                        a dictionary of their values.
+        :returns: A dictionary of the values per key.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not has_app_context():
+            return factory(keys) if keys else {}
+
+        store = self._store
+        now = time.monotonic()
+        values = {}
+        missing = []
+        for key in keys:
+            entry = self._lookup(store, key, now)
+            if entry is None:
+                missing.append(key)
+            else:
+                values[key] = entry[0]
+
+        if missing:
+            computed = factory(missing)
+            for key in missing:
+                values[key] = computed[key]
+                self._add(store, key, computed[key], now)
+        return values
+
+    def set(self, key, value):
+        """Set the value for the key."""
+        if has_app_context():
+            self._add(self._store, key, value, time.monotonic())
+
+    def pop(self, key):
+        """Remove the entry for the key (if any)."""
+        if has_app_context():
+            self._store["entries"].pop(key, None)
+
+    def clear(self):
+        """Clear the cache of the current application context."""
+        if has_app_context():
+            g.pop(f"_requests_cache_{self.name}", None)
+
+    @property
+    def stats(self):
+        """Hit/miss statistics of the current application context."""
+        if not has_app_context():
+            return {"hits": 0, "misses": 0, "size": 0}
+        store = self._store
+        return {
+            "hits": store["hits"],
+            "misses": store["misses"],
+            "size": len(store["entries"]),
+        }
+
+
+entity_needs_cache = RequestScopedCache(
+    "entity_needs",
+    maxsize="REQUESTS_ENTITY_NEEDS_CACHE_MAXSIZE",
+    ttl="REQUESTS_ENTITY_NEEDS_CACHE_TTL",
+)
+"""Cache of the needs of entities (e.g. a community's members)."""
+
+expanded_entities_cache = RequestScopedCache(
+    "expanded_entities",
+    maxsize="REQUESTS_EXPANDED_ENTITIES_CACHE_MAXSIZE",
+    ttl="REQUESTS_EXPANDED_ENTITIES_CACHE_TTL",
+)
+"""Cache of the entities resolved to expand the results (e.g. ``created_by``)."""
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Command-line tools for requests."""
+
+import click
+from flask.cli import with_appcontext
+from invenio_access.permissions import system_identity
+from invenio_db import db
+
+from .proxies import current_requests, current_requests_service
+from .records.models import RequestMetadata
+from .tasks import backfill_participants as backfill_participants_task
+
+
+@click.group()
+def requests():
+    """Requests commands."""
+
+
+@requests.command("backfill-last-reply")
+@click.option(
+    "--chunk-size",
+    default=1000,
+    show_default=True,
+    type=int,
+    help="Number of requests to update per transaction.",
+)
+@with_appcontext
+def backfill_last_reply(chunk_size):
+    """Recompute the denormalized last reply of all requests.
+
+    Note: the requests have to be reindexed afterwards for the changes to be
+    reflected in the search index.
+    """
+    model_cls = RequestMetadata
+    last_id = None
+    total = 0
+    while True:
+        query = db.session.query(model_cls.id).order_by(model_cls.id)
+        if last_id is not None:
+            query = query.filter(model_cls.id > last_id)
+        ids = [row.id for row in query.limit(chunk_size)]
+        if not ids:
+            break
+
+        model_cls.sync_last_reply(ids=ids)
+        db.session.commit()
+
+        last_id = ids[-1]
+        total += len(ids)
+        click.echo(f"Updated {total} requests.")
+
+
+@requests.command("backfill-participants")
+@click.option(
+    "--chunk-size",
+    default=1000,
+    show_default=True,
+    type=int,
+    help="Number of requests to update per transaction.",
+)
+@with_appcontext
+def backfill_participants(chunk_size):
+    """Recompute the denormalized participants of all requests, and reindex them.
+
+    The mapping of the requests index must include the ``participants`` field
+    (see ``invenio index update``).
+    """
+    total = backfill_participants_task(chunk_size=chunk_size)
+    click.echo(f"Updated {total} requests.")
+
+
+@requests.command("rebuild-index")
+@click.option(
+    "--chunk-size",
+    default=1000,
+    show_default=True,
+    type=int,
+    help="Number of requests to load from the database at once.",
+)
+@with_appcontext
+def rebuild_index(chunk_size):
+    """Reindex all requests."""
+    if current_requests_service.rebuild_index(system_identity, chunk_size=chunk_size):
+        click.secho("Requests reindexed.", fg="green")
+    else:
+        click.secho("Some requests failed to be reindexed.", fg="red")
+
+
+@requests.command("warm-up")
+@with_appcontext
+def warm_up():
+    """Create the schemas of all registered request and event types."""
+    count = current_requests.schema_registry.warm_up(
+        current_requests.request_type_registry, current_requests.event_type_registry
+    )
+    click.secho(f"Created the schemas of {count} types.", fg="green")
@@ -144,6 +144,65 @@ This limits the size of indexed documents when comments have many replies.
 Additional replies can be loaded via pagination.
 """
 
+REQUESTS_COMMENT_NOTIFICATIONS_DIGEST_WINDOW = None
+"""Time (in seconds) during which comment notifications are merged into a digest.
+
+The notifications of the comments posted by the same user on the same request
+(or replies in the same thread) within the window are merged into one
+notification, sent when the window ends. ``None`` sends one notification per
+comment, right away.
+
+When enabled, periodically run the
+``invenio_requests.tasks.send_pending_comment_notifications`` task (e.g. with
+``CELERY_BEAT_SCHEDULE``) to send the digests whose task was lost.
+"""
+
+REQUESTS_BULK_ACTION_CHUNK_SIZE = 500
+"""Number of requests processed per transaction when executing bulk actions."""
+
+REQUESTS_BULK_CREATE_CHUNK_SIZE = 500
+"""Number of requests inserted per transaction when creating requests in bulk."""
+
+REQUESTS_ENTITY_NEEDS_CACHE_MAXSIZE = 1000
+"""Maximum number of entities whose needs are cached per HTTP request or task."""
+
+REQUESTS_ENTITY_NEEDS_CACHE_TTL = 300
+"""Time (in seconds) after which cached entity needs are resolved again."""
+
+REQUESTS_EXPANDED_ENTITIES_CACHE_MAXSIZE = 1000
+"""Maximum number of entities resolved for expansion cached per HTTP request or task."""
+
+REQUESTS_EXPANDED_ENTITIES_CACHE_TTL = 60
+"""Time (in seconds) after which the entities are resolved again for expansion."""
+
+REQUESTS_RECORD_LOADER_MAXSIZE = 1000
+"""Maximum number of requests kept loaded per HTTP request or task."""
+
+REQUESTS_SCHEMAS_WARM_UP = True
+"""Create the schemas of the registered request and event types at startup."""
+
+REQUESTS_PERMISSION_NEEDS_CACHE_MAXSIZE = 1000
+"""Maximum number of permission needs cached per HTTP request or task."""
+
+REQUESTS_EVENTS_BATCH_PERMISSIONS = False
+"""Evaluate the permissions on the events of a result list in bulk.
+
+The permissions are evaluated once per distinct event type and creator. Only
+enable it if the events' permissions do not depend on other event properties
+(e.g. the payload or creation date of the event), otherwise the permissions of
+an event could be computed from another one.
+"""
+
+REQUESTS_ACTIONS_BATCH_PERMISSIONS = False
+"""Evaluate the availability of the actions links of requests in bulk.
+
+The actions are evaluated once per distinct request type, status and entities
+(e.g. for the hits of a search results page). Only enable it if the actions'
+permissions and conditions do not depend on other request properties (e.g.
+the ID, payload or expiration date of the request), otherwise the links of a
+request could be computed from another one.
+"""
+
 REQUESTS_FILES_DEFAULT_QUOTA_SIZE = 100 * 10**6  # 100MB
 REQUESTS_FILES_DEFAULT_MAX_FILE_SIZE = 10 * 10**6  # 10MB
 
@@ -159,3 +218,18 @@ REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_ATTRS = {
     "img": ["src", "alt", "width", "height"],
 }
 """Extend allowed HTML attrs list for requests comments content."""
+
+REQUESTS_COMMENTS_SANITIZE_CACHE_MAXSIZE = 10 * 10**6
+"""Maximum total size (in characters) of the sanitized comments cached per process.
+
+Set to ``0`` to disable the in-memory cache.
+"""
+
+REQUESTS_COMMENTS_SANITIZE_CACHE_MIN_SIZE = 2048
+"""Minimum size (in characters) of the comments whose sanitized content is cached."""
+
+REQUESTS_COMMENTS_SANITIZE_SHARED_CACHE = False
+"""Share the sanitized comments between processes, through Invenio-Cache."""
+
+REQUESTS_COMMENTS_SANITIZE_SHARED_CACHE_TTL = 24 * 60 * 60
+"""Time (in seconds) after which the sanitized comments expire from the shared cache."""
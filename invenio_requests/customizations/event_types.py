@@ -7,7 +7,6 @@ import inspect
 from uuid import UUID
 
 import marshmallow as ma
-from flask import current_app
 from invenio_i18n import lazy_gettext as _
 from marshmallow import RAISE, Schema, ValidationError, fields, validate
 from marshmallow.validate import OneOf
@@ -36,16 +35,11 @@ class RequestsCommentsSanitizedHTML(utils_fields.SanitizedHTML):
 
     def _deserialize(self, value, attr, data, **kwargs):
         """Deserialize value with dynamic HTML tags and attributes based on Flask app context or defaults."""
-        self.tags = (
-            current_app.config.get("ALLOWED_HTML_TAGS", [])
-            + current_app.config["REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_TAGS"]
+        # skip the sanitization of the parent class
+        value = super(utils_fields.SanitizedHTML, self)._deserialize(
+            value, attr, data, **kwargs
         )
-        self.attrs = {
-            **current_app.config.get("ALLOWED_HTML_ATTRS", {}),
-            **current_app.config["REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_ATTRS"],
-        }
-
-        return super()._deserialize(value, attr, data, **kwargs)
+        return current_requests.comments_sanitizer.sanitize(value)
 
 
 class EventType:
@@ -77,6 +71,9 @@ class EventType:
     payload_required = False
     """Require the event payload."""
 
+    schema_config_keys = ()
+    """Config variables the marshmallow schema of the type depends on."""
+
     allow_children = False
     """Allow this event type to have children (parent-child relationships).
 
@@ -141,12 +138,7 @@ class EventType:
     @classmethod
     def marshmallow_schema(cls):
         """Create a schema for the entire request including payload."""
-        type_id = cls.type_id
-        if type_id not in current_requests._events_schema_cache:
-            current_requests._events_schema_cache[type_id] = (
-                cls._create_marshmallow_schema()
-            )
-        return current_requests._events_schema_cache[type_id]
+        return current_requests.schema_registry.get(cls)
 
 
 class LogEventType(EventType):
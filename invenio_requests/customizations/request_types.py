@@ -17,6 +17,7 @@ from invenio_records_resources.services.references import (
     MultipleEntityReferenceBaseSchema,
 )
 
+from ..cache import entity_needs_cache
 from ..notifications.builders import (
     CommentRequestEventCreateNotificationBuilder,
     CommentRequestEventReplyNotificationBuilder,
@@ -100,6 +101,15 @@ class RequestType:
     argument.
     """
 
+    index_refresh = True
+    """Index refresh mode when executing an action on requests of this type.
+
+    ``True`` refreshes the index right after the action, so that the changes are
+    immediately searchable. ``"wait_for"`` does not force a refresh, but waits
+    for the changes to become searchable before returning. ``False`` neither
+    forces nor waits for a refresh, which is the cheapest for high-traffic types.
+    """
+
     creator_can_be_none = True
     """Determines if the ``created_by`` reference accepts ``None``.
     In case of ``None`` the creator will be ``System``."""
@@ -145,6 +155,13 @@ class RequestType:
     allowed_files_ref_types = ["enabled"]
     """A list of allowed TYPE keys for ``files`` reference dicts."""
 
+    schema_config_keys = (
+        "REQUESTS_REVIEWERS_ENABLED",
+        "REQUESTS_LOCKING_ENABLED",
+        "USERS_RESOURCES_GROUPS_ENABLED",
+    )
+    """Config variables the marshmallow schema of the type depends on."""
+
     payload_schema = None
     payload_schema_cls = None
     """Schema for supported payload fields.
@@ -185,9 +202,22 @@ class RequestType:
 
     @classmethod
     def entity_needs(cls, entity):
-        """Generate entity needs for the given entity."""
+        """Generate entity needs for the given entity.
+
+        The needs are cached for the current HTTP request or task, since the
+        same entities (e.g. a community receiving many requests) are resolved
+        over and over when dumping requests and checking permissions.
+        """
         if entity is not None:
-            return entity.get_needs(ctx=cls.needs_context)
+            key = (
+                cls.type_id,
+                tuple(sorted(entity.reference_dict.items())),
+            )
+            return list(
+                entity_needs_cache.get(
+                    key, lambda: entity.get_needs(ctx=cls.needs_context)
+                )
+            )
         return []
 
     @classmethod
@@ -261,21 +291,24 @@ class RequestType:
     @classmethod
     def marshmallow_schema(cls):
         """Create a schema for the entire request including payload."""
-        type_id = cls.type_id
-        if type_id not in current_requests._schema_cache:
-            current_requests._schema_cache[type_id] = cls._create_marshmallow_schema()
-        return current_requests._schema_cache[type_id]
+        return current_requests.schema_registry.get(cls)
 
-    def generate_request_number(self, request, **kwargs):
+    def generate_request_number(self, request, sequence_value=None, **kwargs):
         """Generate a new request number identifier.
 
         This method can be overridden in subclasses to create external identifiers
         according to a custom schema, using the information associated with the request
         (e.g. topic, receiver, creator).
+
+        :param sequence_value: Value already reserved in the request number
+                               sequence (e.g. by a bulk creation), used instead
+                               of reserving a new one.
         """
         from invenio_requests.records.models import RequestNumber
 
-        return base32.encode(RequestNumber.next())
+        if sequence_value is None:
+            sequence_value = RequestNumber.next()
+        return base32.encode(sequence_value)
 
     def __str__(self):
         """Return str(self)."""
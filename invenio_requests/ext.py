@@ -9,10 +9,14 @@
 
 import inspect
 
+from flask import current_app
 from invenio_base.utils import entry_points
+from invenio_db import db
+from sqlalchemy import event
 
 from . import config
-from .registry import TypeRegistry
+from .records.loader import record_loader
+from .registry import SchemaRegistry, TypeRegistry
 from .resources import (
     RequestCommentsResource,
     RequestCommentsResourceConfig,
@@ -21,6 +25,7 @@ from .resources import (
     RequestsResource,
     RequestsResourceConfig,
 )
+from .sanitizer import HTMLSanitizer
 from .services import (
     RequestEventsService,
     RequestEventsServiceConfig,
@@ -41,8 +46,10 @@ class InvenioRequests:
         self.requests_resource = None
         self.request_events_service = None
         self.request_files_service = None
-        self._schema_cache = {}
-        self._events_schema_cache = {}
+        self.schema_registry = SchemaRegistry()
+        self._comments_sanitizer = None
+        self.url_templates = {}
+        self.compiled_generators = {}
         if app:
             self.init_app(app)
 
@@ -52,8 +59,48 @@ class InvenioRequests:
         self.init_services(app)
         self.init_resources(app)
         self.init_registry(app)
+        app.teardown_appcontext(record_loader.log_loads)
+        # the records are not reused across transactions
+        event.listen(db.session, "after_commit", record_loader.clear)
+        event.listen(db.session, "after_rollback", record_loader.clear)
         app.extensions["invenio-requests"] = self
 
+    @property
+    def comments_sanitizer(self):
+        """Sanitizer of the comments' HTML content.
+
+        The sanitizer is built once, and again only if the allow-lists in the
+        config are replaced.
+        """
+        config = current_app.config
+        sources = (
+            config.get("ALLOWED_HTML_TAGS", []),
+            config.get("ALLOWED_HTML_ATTRS", {}),
+            config["REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_TAGS"],
+            config["REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_ATTRS"],
+        )
+        if self._comments_sanitizer is not None:
+            built_from, sanitizer = self._comments_sanitizer
+            if all(a is b for a, b in zip(built_from, sources)):
+                return sanitizer
+
+        shared_cache = None
+        if config["REQUESTS_COMMENTS_SANITIZE_SHARED_CACHE"]:
+            from invenio_cache import current_cache
+
+            shared_cache = current_cache
+
+        sanitizer = HTMLSanitizer(
+            tags=sources[0] + sources[2],
+            attrs={**sources[1], **sources[3]},
+            cache_maxsize=config["REQUESTS_COMMENTS_SANITIZE_CACHE_MAXSIZE"],
+            cache_min_size=config["REQUESTS_COMMENTS_SANITIZE_CACHE_MIN_SIZE"],
+            shared_cache=shared_cache,
+            shared_cache_ttl=config["REQUESTS_COMMENTS_SANITIZE_SHARED_CACHE_TTL"],
+        )
+        self._comments_sanitizer = (sources, sanitizer)
+        return sanitizer
+
     def init_config(self, app):
         """Initialize configuration."""
         for k in dir(config):
@@ -167,3 +214,11 @@ def init(app):
 
     idx_reg.register(requests_service.indexer, indexer_id="requests")
     idx_reg.register(events_service.indexer, indexer_id="events")
+
+    # Create the schemas up front (i.e. before the workers are forked), rather
+    # than on the first HTTP request of each worker
+    if app.config["REQUESTS_SCHEMAS_WARM_UP"]:
+        with app.app_context():
+            requests_ext.schema_registry.warm_up(
+                requests_ext.request_type_registry, requests_ext.event_type_registry
+            )
@@ -28,15 +28,19 @@ class CommentRequestEventCreateNotificationBuilder(NotificationBuilder):
     type = "comment-request-event.create"
 
     @classmethod
-    def build(cls, request, request_event):
-        """Build notification with context."""
-        return Notification(
-            type=cls.type,
-            context={
-                "request": EntityResolverRegistry.reference_entity(request),
-                "request_event": EntityResolverRegistry.reference_entity(request_event),
-            },
-        )
+    def build(cls, request, request_event, digest_size=1):
+        """Build notification with context.
+
+        :param digest_size: Number of comments merged in the notification, of
+                            which ``request_event`` is the latest one.
+        """
+        context = {
+            "request": EntityResolverRegistry.reference_entity(request),
+            "request_event": EntityResolverRegistry.reference_entity(request_event),
+        }
+        if digest_size > 1:
+            context["digest_size"] = digest_size
+        return Notification(type=cls.type, context=context)
 
     context = [
         EntityResolve(key="request"),
@@ -10,7 +10,7 @@ from invenio_records.dictutils import dict_lookup
 from invenio_search.engine import dsl
 from invenio_users_resources.proxies import current_users_service
 
-from ..proxies import current_events_service
+from ..proxies import current_events_service, current_requests_service
 
 
 def _get_user_id_from_entity(entity_field):
@@ -47,6 +47,8 @@ class RequestParticipantsRecipient(RecipientGenerator):
 
     def __call__(self, notification, recipients: dict):
         """Fetch users involved in request and add as recipients."""
+        from ..records.loader import record_loader
+
         request = dict_lookup(notification.context, self.key)
 
         # checking if entities are users. If not, we will not add them.
@@ -61,20 +63,24 @@ class RequestParticipantsRecipient(RecipientGenerator):
         if receiver_user_id:
             user_ids.add(receiver_user_id)
 
-        # fetching all request events to get involved users
-        request_events = current_events_service.scan(
-            request_id=request["id"],
-            identity=system_identity,
-            extra_filter=dsl.Q("term", request_id=request["id"]),
-        )
-
-        user_ids.update(
-            {
+        # users who created events on the request, denormalized on the request
+        participants = record_loader.get(
+            current_requests_service.record_cls, request["id"]
+        ).participants
+        if participants is None:
+            # e.g. participants not backfilled yet, falling back to fetching all
+            # request events to get involved users
+            request_events = current_events_service.scan(
+                request_id=request["id"],
+                identity=system_identity,
+                extra_filter=dsl.Q("term", request_id=request["id"]),
+            )
+            participants = {
                 re["created_by"]["user"]
                 for re in request_events
                 if re["created_by"].get("user")
             }
-        )
+        user_ids.update(participants)
 
         # remove system_user_id if present
         user_ids.discard(system_identity.id)
@@ -111,50 +117,13 @@ class CommentRepliesParticipantsRecipient(RecipientGenerator):
         # If this event has a parent_id, use it. Otherwise, this IS the parent.
         parent_id = request_event.get("parent_id") or request_event["id"]
 
-        user_ids = set()
-
-        # Get parent event and its creator
-        try:
-            parent_event = current_events_service.read(
-                identity=system_identity, id_=parent_id
-            ).to_dict()
-
-            parent_user_id = _get_user_id_from_entity(
-                parent_event.get("created_by", {})
+        # Get the authors of the parent event and of all its replies
+        user_ids = set(
+            current_events_service.thread_participants(
+                system_identity, request["id"], parent_id
             )
-            if parent_user_id:
-                user_ids.add(parent_user_id)
-        except Exception:
-            # Parent not found or error reading, skip
-            pass
-
-        # Get all replies to the parent event for the given request
-        replies_filter = dsl.Q(
-            "bool",
-            must=[
-                dsl.Q("term", request_id=request["id"]),
-                dsl.Q("term", parent_id=parent_id),
-            ],
-        )
-        # Get all children (replies) and their creators
-        # NOTE: To be improved in https://github.com/inveniosoftware/invenio-requests/issues/508
-        children_events = current_events_service.scan(
-            identity=system_identity,
-            request_id=request["id"],
-            extra_filter=replies_filter,
         )
 
-        user_ids.update(
-            {
-                child["created_by"]["user"]
-                for child in children_events
-                if child.get("created_by", {}).get("user")
-            }
-        )
-
-        # Remove system user if present
-        user_ids.discard(system_identity.id)
-
         # Fetch users and add as recipients
         if user_ids:
             filter_ = dsl.Q("terms", **{"id": list(user_ids)})
@@ -4,16 +4,20 @@
 
 """API classes for requests in Invenio."""
 
+import uuid
 from enum import Enum
 from functools import partial
 
 from flask import current_app
+from invenio_access.permissions import system_user_id
 from invenio_db import db
 from invenio_files_rest.models import ObjectVersion
 from invenio_records.dumpers import SearchDumper
 from invenio_records.systemfields import ConstantField, DictField, ModelField
 from invenio_records_resources.records.api import FileRecord, Record
 from invenio_records_resources.records.systemfields import IndexField
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import joinedload
 
 from invenio_requests.records.systemfields.files import RequestFilesField
 
@@ -23,7 +27,12 @@ from .dumpers import (
     GrantTokensDumperExt,
     ParentChildDumperExt,
 )
-from .models import RequestEventModel, RequestFileMetadata, RequestMetadata
+from .models import (
+    RequestEventModel,
+    RequestFileMetadata,
+    RequestMetadata,
+    RequestParticipantModel,
+)
 from .systemfields import (
     EntityReferenceField,
     EventTypeField,
@@ -31,6 +40,7 @@ from .systemfields import (
     IdentityField,
     LastActivity,
     LastReply,
+    Participants,
     RequestStateCalculatedField,
     RequestStatusField,
     RequestTypeField,
@@ -51,7 +61,61 @@ class RequestEventFormat(Enum):
     HTML = "html"
 
 
-class RequestEvent(Record):
+class BulkCreateMixin:
+    """Create records in bulk, with a single multi-row insert.
+
+    Same as calling ``create()`` for each record, except that the records are
+    added to the session together (without a savepoint for each record) and
+    with their final data, so that they are inserted by a single multi-row
+    insert when the session is flushed.
+    """
+
+    @classmethod
+    def build(cls, data, **kwargs):
+        """Build a new record, added to the session but not flushed yet.
+
+        The record is inserted by ``insert_many()``, after it is completed
+        (e.g. by the service components).
+        """
+        record = cls(data, model=cls.model_cls(id=uuid.uuid4(), data=data), **kwargs)
+        for e in cls._extensions:
+            e.pre_create(record)
+        db.session.add(record.model)
+        return record
+
+    @classmethod
+    def insert_many(cls, records, format_checker=None, validator=None):
+        """Validate and insert records built with ``build()``.
+
+        :returns: The list of inserted records.
+        """
+        for record in records:
+            record.model.json = record._validate(
+                format_checker=format_checker, validator=validator
+            )
+        db.session.flush()
+
+        for record in records:
+            for e in cls._extensions:
+                e.post_create(record)
+        return records
+
+    @classmethod
+    def create_many(cls, records, format_checker=None, validator=None):
+        """Create several records, inserted in the database all at once.
+
+        :param records: Iterable of ``(data, kwargs)`` tuples, i.e. the arguments
+                        of ``create()`` for each record.
+        :returns: The list of created records.
+        """
+        return cls.insert_many(
+            [cls.build(data, **kwargs) for data, kwargs in records],
+            format_checker=format_checker,
+            validator=validator,
+        )
+
+
+class RequestEvent(BulkCreateMixin, Record):
     """A Request Event."""
 
     model_cls = RequestEventModel
@@ -94,6 +158,42 @@ class RequestEvent(Record):
     parent_id = DictField("parent_id")
     """The parent event ID for parent-child relationships."""
 
+    @classmethod
+    def get_record_with_request(
+        cls, id_, with_deleted=False, with_parent=False, request_cls=None
+    ):
+        """Retrieve an event together with its request, in a single query.
+
+        :param id_: Event ID.
+        :param with_deleted: If ``True``, deleted events are included.
+        :param with_parent: If ``True``, the parent event of a reply is retrieved
+                            too (with an additional query).
+        :param request_cls: The request class, defaults to ``Request``.
+        :returns: A tuple ``(event, request, parent)``, ``parent`` being
+                  ``None`` if not requested or if the event is not a reply.
+        :raises sqlalchemy.exc.NoResultFound: If the event or its request does
+                                              not exist (or is deleted).
+        """
+        request_cls = request_cls or Request
+        with db.session.no_autoflush:
+            query = (
+                db.session.query(cls.model_cls)
+                .options(joinedload(cls.model_cls.request))
+                .filter_by(id=id_)
+            )
+            if not with_deleted:
+                query = query.filter(cls.model_cls.is_deleted != True)  # noqa
+            obj = query.one()
+            if obj.request is None or obj.request.is_deleted:
+                raise NoResultFound()
+
+            event = cls(obj.data, model=obj)
+            request = request_cls(obj.request.data, model=obj.request)
+            parent = None
+            if with_parent and event.parent_id is not None:
+                parent = cls.get_record(event.parent_id, with_deleted=with_deleted)
+        return event, request, parent
+
     def pre_commit(self):
         """Hook called before committing the record.
 
@@ -134,7 +234,7 @@ class RequestFile(FileRecord):
                 yield cls(obj.data, model=obj)
 
 
-class Request(Record):
+class Request(BulkCreateMixin, Record):
     """A generic request record."""
 
     event_cls = RequestEvent
@@ -206,6 +306,9 @@ class Request(Record):
     last_activity_at = LastActivity()
     """The last activity (derived from other fields)."""
 
+    participants = Participants()
+    """The IDs of the users who created events in the request (``None`` if none)."""
+
     is_locked = DictField("is_locked")
     """Whether or not the request is locked."""
 
@@ -221,3 +324,33 @@ class Request(Record):
         create=False,  # Lazy initialization
         bucket_args=get_files_quota,  # Quota config
     )
+
+    def update_last_reply(self, event=None):
+        """Update the denormalized last reply of the request.
+
+        :param event: The comment event which became the last reply. If not given,
+                      the last reply is recomputed from the request's events (e.g.
+                      after a comment was deleted).
+        """
+        if event is not None:
+            self.model_cls.set_last_reply(self.id, event.model)
+        else:
+            self.model_cls.sync_last_reply(ids=[self.id])
+        db.session.expire(self.model, ["last_reply"])
+        # Drop the cached computed fields, so that they are calculated again
+        for field in ("last_reply", "last_activity_at"):
+            getattr(self, "_obj_cache", {}).pop(field, None)
+
+    def add_participants(self, user_ids):
+        """Add users to the denormalized participants of the request.
+
+        Nothing is written if all the users already participate in the request
+        (e.g. a user commenting again), nor for the system user.
+        """
+        participants = set(self.participants or [])
+        new_ids = set(user_ids) - participants - {system_user_id, None}
+        if not new_ids:
+            return
+        RequestParticipantModel.add(self.id, sorted(new_ids))
+        db.session.expire(self.model, ["participants"])
+        getattr(self, "_obj_cache", {}).pop("participants", None)
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Identity map of the records loaded within an HTTP request or task."""
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import inspect
+
+from ..cache import RequestScopedCache
+
+
+class RecordLoader:
+    """Load records by ID, once per application context.
+
+    A record (e.g. a request) loaded by a service is reused by the other
+    services, components and notification builders in the same HTTP request or
+    task, instead of being loaded again from the database. The same record
+    object is returned to all of them, as long as its database row was not
+    changed through another record object, in which case the record is rebuilt
+    from its (already loaded) model.
+
+    Deleted records are not returned, as for ``Record.get_record``. The
+    records are dropped when the transaction of the database session ends, i.e.
+    when it is committed or rolled back (see ``clear()``).
+    """
+
+    def __init__(self, name, maxsize=None):
+        """Constructor.
+
+        :param name: Unique name of the loader.
+        :param maxsize: Maximum number of records, or name of the config
+                        variable holding it (``None`` for unbounded).
+        """
+        self.name = name
+        self._cache = RequestScopedCache(name, maxsize=maxsize)
+
+    def _count_load(self):
+        """Count a load from the database in the current application context."""
+        if has_app_context():
+            attr = f"_requests_loads_{self.name}"
+            setattr(g, attr, g.get(attr, 0) + 1)
+
+    def _load(self, record_cls, id_):
+        """Load a record from the database."""
+        self._count_load()
+        record = record_cls.get_record(id_)
+        return record, record.model.version_id
+
+    def get(self, record_cls, id_):
+        """Get a record by ID.
+
+        :raises sqlalchemy.exc.NoResultFound: If the record does not exist, or
+                                              is deleted.
+        """
+        return self._get(record_cls, id_, lambda: self._load(record_cls, id_))
+
+    def add(self, record):
+        """Add a record loaded by other means (e.g. joined with another record).
+
+        :returns: The record to use, i.e. the one previously loaded if it is
+                  still valid, the given one otherwise.
+        """
+        return self._get(
+            type(record), record.id, lambda: (record, record.model.version_id)
+        )
+
+    def _get(self, record_cls, id_, factory):
+        """Get a valid record from the cache, or add it with the factory."""
+        key = (record_cls, str(id_))
+        record, version_id = self._cache.get(key, factory)
+
+        model = record.model
+        state = inspect(model)
+        if (
+            state.transient
+            or state.detached
+            or state.deleted
+            or state.was_deleted
+            or model.is_deleted
+        ):
+            # deleted, or removed from the session
+            self._cache.pop(key)
+            record, version_id = self._cache.get(key, factory)
+        elif model.version_id != version_id:
+            # updated through another record object
+            record = record_cls(model.data, model=model)
+            self._cache.set(key, (record, model.version_id))
+        return record
+
+    def clear(self, session=None):
+        """Drop the records loaded in the current application context.
+
+        Called on the ``after_commit`` and ``after_rollback`` events of the
+        database session, so that a record is not shared by unrelated units of
+        work of a long-lived context (e.g. a task), and does not keep changes
+        which were not committed: e.g. the models of a rolled back transaction
+        are expired (and reload the same ``version_id``), while the records
+        built from them still hold the rolled back changes.
+        """
+        self._cache.clear()
+
+    @property
+    def loads(self):
+        """Number of records loaded from the database in the current context."""
+        if not has_app_context():
+            return 0
+        return g.get(f"_requests_loads_{self.name}", 0)
+
+    def log_loads(self, exception=None):
+        """Log the number of records loaded from the database (for debugging)."""
+        if self.loads:
+            current_app.logger.debug(
+                "%s: %d record(s) loaded from the database, %d reused",
+                self.name,
+                self.loads,
+                self._cache.stats["hits"],
+            )
+
+
+record_loader = RecordLoader("records", maxsize="REQUESTS_RECORD_LOADER_MAXSIZE")
+"""Loader of the requests (and other records) within an HTTP request or task."""
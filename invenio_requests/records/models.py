@@ -5,12 +5,25 @@
 """Base classes for requests in Invenio."""
 
 import uuid
+from datetime import datetime, timezone
 
+from invenio_access.permissions import system_user_id
 from invenio_db import db
 from invenio_files_rest.models import Bucket
 from invenio_records.models import RecordMetadataBase
 from invenio_records_resources.records import FileRecordModelMixin
-from sqlalchemy import ForeignKeyConstraint, UniqueConstraint, func
+from sqlalchemy import (
+    ForeignKeyConstraint,
+    UniqueConstraint,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.dialects import mysql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declared_attr
@@ -44,6 +57,81 @@ class RequestMetadata(db.Model, RecordMetadataBase):
     )
     bucket = db.relationship(Bucket)
 
+    # Denormalized activity tracking, maintained by the request events service.
+    # NOTE: No foreign key on purpose, to avoid a dependency cycle between the
+    # `request_metadata` and `request_events` tables.
+    last_reply_id = db.Column(UUIDType, nullable=True)
+    """Identifier of the most recent comment event on the request."""
+
+    last_activity_at = db.Column(db.UTCDateTime(), nullable=True)
+    """Creation timestamp of the most recent comment event on the request."""
+
+    # Joined, so that the requests are dumped without an extra query per request
+    last_reply = db.relationship(
+        "RequestEventModel",
+        primaryjoin="foreign(RequestMetadata.last_reply_id) == RequestEventModel.id",
+        viewonly=True,
+        lazy="joined",
+    )
+
+    participants = db.relationship(
+        "RequestParticipantModel",
+        order_by="RequestParticipantModel.user_id",
+        viewonly=True,
+    )
+
+    @classmethod
+    def set_last_reply(cls, id_, event):
+        """Set the given event as the last reply of a request.
+
+        :param id_: The ID of the request.
+        :param event: The ``RequestEventModel`` of the new last reply.
+        """
+        cls._update_activity(
+            cls.id == id_, last_reply_id=event.id, last_activity_at=event.created
+        )
+
+    @classmethod
+    def sync_last_reply(cls, ids=None):
+        """Recompute the last reply of requests from the events table.
+
+        :param ids: Optional list of request IDs to restrict the update to. If not
+                    given, all requests are updated.
+        """
+        # Avoid circular imports
+        from ..customizations.event_types import CommentEventType
+
+        events = RequestEventModel.__table__
+        last_comment = (
+            select(events.c.id)
+            .where(
+                events.c.request_id == cls.id,
+                events.c.type == CommentEventType.type_id,
+            )
+            .order_by(events.c.created.desc())
+            .limit(1)
+        )
+        cls._update_activity(
+            cls.id.in_(ids) if ids is not None else None,
+            last_reply_id=last_comment.scalar_subquery(),
+            last_activity_at=last_comment.with_only_columns(
+                events.c.created
+            ).scalar_subquery(),
+        )
+
+    @classmethod
+    def _update_activity(cls, whereclause, **values):
+        """Update the activity columns.
+
+        A bulk update is used on purpose: it bypasses the version counter, so
+        that new activity on a request does not bump its revision (and does not
+        conflict with concurrent updates of the request itself).
+        """
+        stmt = update(cls).values(**values)
+        if whereclause is not None:
+            stmt = stmt.where(whereclause)
+        db.session.execute(stmt, execution_options={"synchronize_session": "fetch"})
+
 
 class RequestFileMetadata(db.Model, RecordMetadataBase, FileRecordModelMixin):
     """Files associated with a request."""
@@ -67,6 +155,181 @@ class RequestEventModel(db.Model, RecordMetadataBase):
     )
     request = db.relationship(RequestMetadata)
 
+    @classmethod
+    def last_updated_events(cls, request_id):
+        """Get the events of a request which were modified last.
+
+        :returns: The ``(id, updated)`` pairs of the events modified within the
+                  same millisecond as the last modified one, which have the
+                  same modification date in the search index (whose dates have
+                  a millisecond precision).
+        """
+        last_updated = (
+            db.session.query(func.max(cls.updated))
+            .filter(cls.request_id == request_id)
+            .scalar()
+        )
+        if last_updated is None:
+            return []
+        since = last_updated.replace(
+            microsecond=last_updated.microsecond // 1000 * 1000
+        )
+        return (
+            db.session.query(cls.id, cls.updated)
+            .filter(cls.request_id == request_id, cls.updated >= since)
+            .all()
+        )
+
+    @classmethod
+    def thread_participants(cls, request_id, parent_id):
+        """Get the IDs of the users who created the events of a comment thread.
+
+        The thread is made of the parent comment and its replies, and the
+        distinct authors are selected by the database (the system user is
+        excluded).
+        """
+        parent_id = str(parent_id)
+        author = cls.json[("created_by", "user")].as_string()
+        query = (
+            db.session.query(author)
+            .filter(
+                cls.request_id == request_id,
+                or_(
+                    cls.id == parent_id,
+                    cls.json["parent_id"].as_string() == parent_id,
+                ),
+                author.isnot(None),
+                author != system_user_id,
+            )
+            .distinct()
+        )
+        return sorted(user_id for (user_id,) in query)
+
+
+class RequestParticipantModel(db.Model):
+    """Users participating in a request, i.e. who created events on it.
+
+    The participants are denormalized from the events of the requests, and
+    maintained by the request events service.
+    """
+
+    __tablename__ = "request_participants"
+
+    request_id = db.Column(
+        UUIDType,
+        db.ForeignKey(RequestMetadata.id, ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = db.Column(String(255), primary_key=True)
+
+    @classmethod
+    def add(cls, request_id, user_ids):
+        """Add users to the participants of a request.
+
+        Users who already participate in the request are ignored, so that
+        concurrent additions of the same participant do not conflict.
+        """
+        rows = [{"request_id": request_id, "user_id": u} for u in user_ids]
+        if not rows:
+            return
+
+        dialect = db.engine.dialect.name
+        if dialect == "postgresql":  # pragma: no cover
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            stmt = pg_insert(cls.__table__).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            stmt = sqlite_insert(cls.__table__).on_conflict_do_nothing()
+        else:  # pragma: no cover
+            stmt = insert(cls.__table__).prefix_with("IGNORE")
+        db.session.execute(stmt, rows)
+
+    @classmethod
+    def sync(cls, ids):
+        """Recompute the participants of requests from the events table.
+
+        :param ids: List of request IDs to update.
+        """
+        events = (
+            db.session.query(RequestEventModel.request_id, RequestEventModel.json)
+            .filter(RequestEventModel.request_id.in_(ids))
+            .yield_per(1000)
+        )
+        rows = set()
+        for request_id, data in events:
+            user_id = ((data or {}).get("created_by") or {}).get("user")
+            if user_id and user_id != system_user_id:
+                rows.add((request_id, user_id))
+
+        db.session.execute(delete(cls).where(cls.request_id.in_(ids)))
+        if rows:
+            db.session.execute(
+                insert(cls.__table__),
+                [{"request_id": r, "user_id": u} for r, u in sorted(rows)],
+            )
+
+
+class RequestPendingNotificationModel(db.Model):
+    """Comment notifications waiting to be sent as a digest.
+
+    The pending notifications are grouped by a key (e.g. the request, thread and
+    author of the comments), and are popped all at once when the digest is sent.
+    """
+
+    __tablename__ = "request_pending_notifications"
+
+    event_id = db.Column(
+        UUIDType,
+        db.ForeignKey(RequestEventModel.id, ondelete="CASCADE"),
+        primary_key=True,
+    )
+    request_id = db.Column(
+        UUIDType,
+        db.ForeignKey(RequestMetadata.id, ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    key = db.Column(String(64), nullable=False, index=True)
+    created = db.Column(
+        db.UTCDateTime(), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+    @classmethod
+    def add(cls, key, request_id, event_id):
+        """Add the notification of an event to the digest with the given key."""
+        # Added to the session (and not inserted right away) so that it is
+        # flushed after the event it refers to.
+        db.session.add(cls(key=key, request_id=request_id, event_id=event_id))
+
+    @classmethod
+    def pop(cls, key):
+        """Remove the pending notifications with the given key.
+
+        :returns: The IDs of the events, in the order they were added.
+        """
+        event_ids = [
+            row.event_id
+            for row in db.session.query(cls.event_id)
+            .filter(cls.key == key)
+            .order_by(cls.created, cls.event_id)
+            .with_for_update()
+        ]
+        if event_ids:
+            db.session.execute(delete(cls).where(cls.event_id.in_(event_ids)))
+        return event_ids
+
+    @classmethod
+    def keys_pending_since(cls, before):
+        """Get the keys with notifications pending since before the given date."""
+        return [
+            row.key
+            for row in db.session.query(cls.key)
+            .group_by(cls.key)
+            .having(func.min(cls.created) < before)
+        ]
+
 
 class SequenceMixin:
     """Integer sequence generator.
@@ -114,6 +377,45 @@ class SequenceMixin:
                 db.session.add(obj)
         return obj.value
 
+    @classmethod
+    def next_many(cls, count):
+        """Return the next ``count`` available integers, reserved at once.
+
+        On PostgreSQL and SQLite, the rows are inserted by a single
+        ``INSERT ... SELECT ... RETURNING`` statement, instead of one statement
+        per value.
+
+        :returns: The list of integers, in increasing order.
+        """
+        if count <= 0:
+            return []
+
+        dialect = db.engine.dialect.name
+        if dialect == "postgresql":  # pragma: no cover
+            values = select(
+                func.nextval(func.pg_get_serial_sequence(cls.__tablename__, "value"))
+            ).select_from(func.generate_series(1, count))
+        elif dialect == "sqlite":
+            series = select(literal(1).label("n")).cte("series", recursive=True)
+            series = series.union_all(select(series.c.n + 1).where(series.c.n < count))
+            values = select(null()).select_from(series)
+        else:  # pragma: no cover
+            return sorted(cls.next() for _ in range(count))
+
+        stmt = (
+            insert(cls.__table__)
+            .from_select(["value"], values)
+            .returning(cls.__table__.c.value)
+        )
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(stmt).scalars().all()
+        except IntegrityError:  # pragma: no cover
+            with db.session.begin_nested():
+                cls._set_sequence(cls.max())
+                result = db.session.execute(stmt).scalars().all()
+        return sorted(result)
+
     @classmethod
     def max(cls):
         """Get max record identifier."""
@@ -3,7 +3,7 @@
 
 """Systemfields for request records."""
 
-from .computed import LastActivity, LastReply
+from .computed import LastActivity, LastReply, Participants
 from .entity_reference import EntityReferenceField
 from .event_type import EventTypeField
 from .expired_state import ExpiredStateCalculatedField
@@ -19,6 +19,7 @@ __all__ = (
     "IdentityField",
     "LastReply",
     "LastActivity",
+    "Participants",
     "RequestStateCalculatedField",
     "RequestStatusField",
     "RequestTypeField",
@@ -7,6 +7,8 @@
 from invenio_records.dictutils import dict_lookup, parse_lookup_key
 from invenio_records.systemfields import SystemField
 
+from ..loader import record_loader
+
 
 class AttrProxy:
     """Attribute proxy.
@@ -31,7 +33,7 @@ class AttrProxy:
     def get_object(self):
         """Get the underlying record."""
         if self._record is None:
-            self._record = self._record_cls.get_record(self._id)
+            self._record = record_loader.get(self._record_cls, self._id)
         return self._record
 
     def get_object_shim(self):
@@ -52,7 +54,7 @@ class AttrProxy:
             if attr in self._attrs:
                 shim = self.get_object_shim()
                 return getattr(shim, attr)
-            self._record = self._record_cls.get_record(self._id)
+            self._record = record_loader.get(self._record_cls, self._id)
         return getattr(self._record, attr)
 
     def __getitem__(self, attr):
@@ -60,7 +62,7 @@ class AttrProxy:
         if self._record is None:
             if attr in self._attrs or attr == "id":
                 return self._data[attr]
-            self._record = self._record_cls.get_record(self._id)
+            self._record = record_loader.get(self._record_cls, self._id)
         return self._record[attr]
 
 
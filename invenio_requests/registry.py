@@ -21,6 +21,8 @@ Afterwards you can lookup types:
         # do something
 """
 
+from flask import current_app
+
 
 class TypeRegistry:
     """Registry for looking up registered types per id/name."""
@@ -28,17 +30,28 @@ class TypeRegistry:
     def __init__(self, types):
         """Constructor."""
         self._registered_types = {}
+        self._version = 0
         for t in types:
             self.register_type(t)
 
+    @property
+    def version(self):
+        """Counter incremented on every change of the registered types.
+
+        Allows to cache values computed from the registered types.
+        """
+        return self._version
+
     def register_type(self, type_, force=False):
         """Register the specified request_type."""
         type_id = type_.type_id
 
         if force:
             self._registered_types[type_id] = type_
-        else:
-            self._registered_types.setdefault(type_id, type_)
+            self._version += 1
+        elif type_id not in self._registered_types:
+            self._registered_types[type_id] = type_
+            self._version += 1
 
     def lookup(self, type_id, quiet=False, default=None):
         """Look up a registered type by its id."""
@@ -51,3 +64,46 @@ class TypeRegistry:
         """Iterate over all types."""
         for t in self._registered_types.values():
             yield t
+
+
+class SchemaRegistry:
+    """Registry of the marshmallow schemas of the request and event types.
+
+    Creating the schema of a type is costly, so schemas are created once per
+    type and values of the config variables they depend on (see the types'
+    ``schema_config_keys``). Changing one of these variables (e.g. enabling
+    locking) thus yields the matching schema.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._schemas = {}
+
+    def _key(self, type_cls):
+        """Key of the schema of a type for the current config."""
+        config = current_app.config
+        return (type_cls, tuple(config.get(k) for k in type_cls.schema_config_keys))
+
+    def get(self, type_cls):
+        """Get the schema of a type, creating it if needed."""
+        key = self._key(type_cls)
+        schema = self._schemas.get(key)
+        if schema is None:
+            schema = self._schemas[key] = type_cls._create_marshmallow_schema()
+        return schema
+
+    def warm_up(self, *registries):
+        """Create the schemas of the types of the given type registries.
+
+        :returns: The number of types.
+        """
+        count = 0
+        for registry in registries:
+            for type_ in registry:
+                self.get(type(type_))
+                count += 1
+        return count
+
+    def clear(self):
+        """Clear all schemas."""
+        self._schemas.clear()
@@ -24,6 +24,8 @@ class RequestCommentsSearchRequestArgsSchema(SearchRequestArgsSchema):
     """Add parameter to parse tags."""
 
     focus_event_id = fields.UUID()
+    cursor = fields.String()
+    since = fields.String()
 
 
 class RequestCommentsResourceConfig(RecordResourceConfig):
@@ -39,6 +41,8 @@ class RequestCommentsResourceConfig(RecordResourceConfig):
         "replies_focused": "/<request_id>/comments/<comment_id>/replies_focused",
         "timeline": "/<request_id>/timeline",
         "timeline_focused": "/<request_id>/timeline_focused",
+        "timeline_cursor": "/<request_id>/timeline_cursor",
+        "timeline_since": "/<request_id>/timeline_since",
     }
 
     # Input
@@ -6,7 +6,7 @@
 
 from copy import deepcopy
 
-from flask import g
+from flask import g, request
 from flask_resources import (
     from_conf,
     request_body_parser,
@@ -58,6 +58,8 @@ class RequestCommentsResource(RecordResource):
             route("DELETE", routes["item"], self.delete),
             route("GET", routes["timeline"], self.search),
             route("GET", routes["timeline_focused"], self.focused_list),
+            route("GET", routes["timeline_cursor"], self.timeline),
+            route("GET", routes["timeline_since"], self.search_since),
             route("GET", routes["replies"], self.get_replies),
             route("GET", routes["replies_focused"], self.focused_replies),
         ]
@@ -173,6 +175,58 @@ class RequestCommentsResource(RecordResource):
         )
         return hits.to_dict(), 200
 
+    @list_view_args_parser
+    @request_extra_args
+    @search_args_parser
+    @response_handler(many=True)
+    def timeline(self):
+        """List a slice of the timeline, paginated with cursors.
+
+        Without a cursor, the slice starts at the event with ID focus_event_id, or at the oldest event if this is not given.
+        """
+        hits = self.service.timeline(
+            identity=g.identity,
+            request_id=resource_requestctx.view_args["request_id"],
+            size=resource_requestctx.args.get("size"),
+            cursor=resource_requestctx.args.get("cursor"),
+            focus_event_id=resource_requestctx.args.get("focus_event_id"),
+            search_preference=search_preference(),
+            expand=resource_requestctx.args.get("expand", False),
+        )
+        return hits.to_dict(), 200
+
+    @list_view_args_parser
+    @request_extra_args
+    @search_args_parser
+    def search_since(self):
+        """List the events created or updated since the cursor since.
+
+        Responds with "304 Not Modified" if the timeline did not change since the entity tag sent by the client.
+        """
+        identity = g.identity
+        request_id = resource_requestctx.view_args["request_id"]
+        response_handler = resource_requestctx.response_handler
+
+        # The tag of the current state is only sent back on "304 Not Modified",
+        # otherwise the tag of the returned events is sent (which can be behind
+        # the database, until the changes are searchable).
+        etag = self.service.timeline_etag(identity, request_id)
+        if request.if_none_match.contains_weak(etag):
+            response = response_handler.make_response(None, 304, many=True)
+        else:
+            hits = self.service.search_since(
+                identity=identity,
+                request_id=request_id,
+                since_cursor=resource_requestctx.args.get("since"),
+                size=resource_requestctx.args.get("size"),
+                search_preference=search_preference(),
+                expand=resource_requestctx.args.get("expand", False),
+            )
+            etag = hits.etag
+            response = response_handler.make_response(hits.to_dict(), 200, many=True)
+        response.set_etag(etag, weak=True)
+        return response
+
     @item_view_args_parser
     @request_extra_args
     @search_args_parser
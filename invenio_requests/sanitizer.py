@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sanitization of the HTML content of comments."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from bleach.css_sanitizer import CSSSanitizer
+from bleach.sanitizer import Cleaner
+from marshmallow_utils.html import ALLOWED_CSS_STYLES, sanitize_unicode
+
+MARKUP_CHARS = frozenset("<>&\r")
+"""Characters which are altered (escaped or normalized) by the HTML sanitizer."""
+
+
+class HTMLSanitizer:
+    """HTML sanitizer with compiled allow-lists and a cache of sanitized values.
+
+    Equivalent to ``marshmallow_utils.html.sanitize_html``, except that:
+
+    - the bleach cleaner is built once per thread (cleaners are not thread-safe)
+      instead of once per sanitized value;
+    - plain-text values, without any markup, skip the HTML parsing;
+    - the sanitized large values (e.g. pasted logs) are cached, keyed by the
+      hash of their content, in memory and optionally in a shared cache.
+    """
+
+    def __init__(
+        self,
+        tags,
+        attrs,
+        css_styles=None,
+        cache_maxsize=0,
+        cache_min_size=0,
+        shared_cache=None,
+        shared_cache_ttl=None,
+    ):
+        """Constructor.
+
+        :param tags: List of allowed tags.
+        :param attrs: Dictionary of allowed attributes per tag.
+        :param css_styles: List of allowed CSS properties.
+        :param cache_maxsize: Maximum total size (in characters) of the sanitized
+                              values cached in memory (``0`` to disable).
+        :param cache_min_size: Minimum size (in characters) of the values to cache.
+        :param shared_cache: Cache shared between processes (e.g. Redis), with
+                             the ``get(key)``/``set(key, value, timeout)``
+                             interface of ``invenio_cache.current_cache``.
+        :param shared_cache_ttl: Time-to-live of the entries of the shared cache.
+        """
+        self.tags = list(tags)
+        self.attrs = dict(attrs)
+        self.css_styles = list(ALLOWED_CSS_STYLES if css_styles is None else css_styles)
+        self.cache_maxsize = cache_maxsize
+        self.cache_min_size = cache_min_size
+        self.shared_cache = shared_cache
+        self.shared_cache_ttl = shared_cache_ttl
+
+        self.fingerprint = hashlib.sha256(
+            json.dumps(
+                [sorted(self.tags), self.attrs, sorted(self.css_styles)],
+                sort_keys=True,
+                default=repr,
+            ).encode("utf-8")
+        ).hexdigest()[:16]
+        """Fingerprint of the allow-lists, to namespace the shared cache."""
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    @property
+    def cleaner(self):
+        """The bleach cleaner of the current thread."""
+        cleaner = getattr(self._local, "cleaner", None)
+        if cleaner is None:
+            cleaner = self._local.cleaner = Cleaner(
+                tags=self.tags,
+                attributes=self.attrs,
+                css_sanitizer=CSSSanitizer(self.css_styles),
+                strip=True,
+            )
+        return cleaner
+
+    def _sanitize(self, value):
+        """Sanitize a value, skipping the HTML parsing of plain text."""
+        value = sanitize_unicode(value)
+        if MARKUP_CHARS.isdisjoint(value):
+            return value.strip()
+        return self.cleaner.clean(value).strip()
+
+    def _get_cached(self, key):
+        """Get a sanitized value from the in-memory cache."""
+        with self._lock:
+            sanitized = self._entries.get(key)
+            if sanitized is not None:
+                self._entries.move_to_end(key)
+            return sanitized
+
+    def _set_cached(self, key, sanitized):
+        """Add a sanitized value to the in-memory cache, evicting the oldest ones."""
+        if len(sanitized) > self.cache_maxsize:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = sanitized
+            self._size += len(sanitized)
+            while self._size > self.cache_maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def sanitize(self, value):
+        """Sanitize an HTML value."""
+        cacheable = len(value) >= self.cache_min_size and (
+            self.cache_maxsize or self.shared_cache is not None
+        )
+        if not cacheable:
+            return self._sanitize(value)
+
+        key = hashlib.sha256(value.encode("utf-8", "surrogatepass")).hexdigest()
+        sanitized = self._get_cached(key) if self.cache_maxsize else None
+        if sanitized is not None:
+            return sanitized
+
+        shared_key = f"requests:sanitized:{self.fingerprint}:{key}"
+        if self.shared_cache is not None:
+            sanitized = self.shared_cache.get(shared_key)
+        if sanitized is None:
+            sanitized = self._sanitize(value)
+            if self.shared_cache is not None:
+                self.shared_cache.set(
+                    shared_key, sanitized, timeout=self.shared_cache_ttl
+                )
+
+        if self.cache_maxsize:
+            self._set_cached(key, sanitized)
+        return sanitized
+
+    def clear(self):
+        """Clear the in-memory cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
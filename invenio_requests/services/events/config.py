@@ -7,7 +7,7 @@
 
 from uuid import UUID
 
-from invenio_indexer.api import RecordIndexer
+from flask import current_app
 from invenio_records_resources.services import (
     RecordServiceConfig,
     ServiceSchemaWrapper,
@@ -27,8 +27,11 @@ from ...services.links import (
     RequestSingleCommentEndpointLink,
     RequestTypeDependentEndpointLink,
 )
+from ..indexer import BulkRecordIndexer
 from ..permissions import PermissionPolicy
+from ..results import CachedFieldsResolver
 from ..schemas import RequestEventSchema
+from .permissions import CommentPermissionsEvaluator
 
 
 def _expand_files_for_projections(projections, request, identity):
@@ -116,6 +119,7 @@ class RequestEventItem(RecordItem):
         request = kwargs.pop("request", None)
         super().__init__(*args, **kwargs)
         self._request = request
+        self._fields_resolver = CachedFieldsResolver(kwargs.get("expandable_fields"))
 
     @property
     def id(self):
@@ -162,6 +166,7 @@ class RequestEventList(RecordList):
         request = kwargs.pop("request", None)
         super().__init__(*args, **kwargs)
         self._request = request
+        self._fields_resolver = CachedFieldsResolver(kwargs.get("expandable_fields"))
 
     def to_dict(self):
         """Return result as a dictionary with expanded fields for parents and children."""
@@ -215,14 +220,30 @@ class RequestEventList(RecordList):
     @property
     def hits(self):
         """Iterator over the hits."""
+        permissions_evaluator = None
+        if current_app.config["REQUESTS_EVENTS_BATCH_PERMISSIONS"]:
+            permissions_evaluator = CommentPermissionsEvaluator(
+                self._service, self._identity, self._request
+            )
+
+        # One (wrapped) schema per event type for the whole page, instantiating a
+        # schema is costly
+        schemas = {}
+
+        def _schema(record):
+            type_id = record.type.type_id
+            if type_id not in schemas:
+                schemas[type_id] = ServiceSchemaWrapper(
+                    self._service, record.type.marshmallow_schema()
+                )
+            return schemas[type_id]
+
         for hit in self._results:
             # Load dump
             record = self._service.record_cls.loads(hit.to_dict())
 
             # Project the record
-            schema = ServiceSchemaWrapper(
-                self._service, record.type.marshmallow_schema()
-            )
+            schema = _schema(record)
             projection = schema.dump(
                 record,
                 context=dict(
@@ -230,6 +251,7 @@ class RequestEventList(RecordList):
                     record=record,
                     request=self._request,  # Need to pass the request to the schema to get the permissions to check if locked
                     meta=hit.meta,
+                    permissions_evaluator=permissions_evaluator,
                 ),
             )
 
@@ -256,9 +278,7 @@ class RequestEventList(RecordList):
                     )
 
                     # Project child record
-                    child_schema = ServiceSchemaWrapper(
-                        self._service, child_record.type.marshmallow_schema()
-                    )
+                    child_schema = _schema(child_record)
                     child_projection = child_schema.dump(
                         child_record,
                         context=dict(
@@ -266,6 +286,7 @@ class RequestEventList(RecordList):
                             record=child_record,
                             request=self._request,  # Need to pass the request to the schema to get the permissions to check if locked
                             meta=hit.meta,
+                            permissions_evaluator=permissions_evaluator,
                         ),
                     )
 
@@ -284,7 +305,33 @@ class RequestEventList(RecordList):
             yield projection
 
 
-class ParentChildRecordIndexer(RecordIndexer):
+class RequestEventCursorList(RequestEventList):
+    """Slice of a request's timeline, paginated with cursors."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor.
+
+        The results are the hits of the slice, in timeline order.
+        """
+        self._cursors = kwargs.pop("cursors", {})
+        self._total = kwargs.pop("total", None)
+        self.etag = kwargs.pop("etag", None)
+        """Entity tag of the timeline, for ``search_since()`` results."""
+        super().__init__(*args, **kwargs)
+
+    @property
+    def total(self):
+        """Get total number of top-level events of the timeline."""
+        return self._total
+
+    def to_dict(self):
+        """Return result as a dictionary, with the cursors of the next/prev slices."""
+        res = super().to_dict()
+        res["cursors"] = self._cursors
+        return res
+
+
+class ParentChildRecordIndexer(BulkRecordIndexer):
     """Parent-Child Record Indexer placeholder."""
 
     def _prepare_record(self, record, index, arguments=None, **kwargs):
@@ -326,6 +373,7 @@ class RequestEventsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     record_cls = RequestEvent
     result_item_cls = RequestEventItem
     result_list_cls = RequestEventList
+    result_cursor_list_cls = RequestEventCursorList
     indexer_queue_name = "events"
     indexer_cls = ParentChildRecordIndexer
 
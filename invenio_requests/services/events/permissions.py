@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Batched evaluation of the permissions on request events."""
+
+
+class CommentPermissionsEvaluator:
+    """Evaluate the permissions to act on the events of a request in bulk.
+
+    The permissions on comments depend on the request (e.g. its status, or
+    whether it is locked) and on the event itself only through its type and its
+    creator (``Commenter``). For a given identity and request, each permission
+    is thus evaluated once per distinct (type, creator) pair of the events,
+    instead of once per event.
+
+    The evaluator is opt-in (see ``REQUESTS_EVENTS_BATCH_PERMISSIONS``), as it
+    must not be used with policies whose generators depend on other properties
+    of the events.
+    """
+
+    def __init__(self, service, identity, request):
+        """Constructor."""
+        self._service = service
+        self._identity = identity
+        self._request = request
+        self._results = {}
+
+    @staticmethod
+    def _event_key(event):
+        """Key of the properties of an event the permissions depend on."""
+        created_by = event.get("created_by") or {}
+        return (event.type.type_id, tuple(sorted(created_by.items())))
+
+    def check_permission(self, action, event):
+        """Check the permission of the identity to perform an action on an event."""
+        key = (action, self._event_key(event))
+        if key not in self._results:
+            self._results[key] = self._service.check_permission(
+                self._identity, action, event=event, request=self._request
+            )
+        return self._results[key]
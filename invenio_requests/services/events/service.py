@@ -7,6 +7,11 @@
 
 """RequestEvents Service."""
 
+import base64
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
 import sqlalchemy.exc
 from flask import current_app
 from flask_principal import AnonymousIdentity
@@ -16,12 +21,9 @@ from invenio_records_resources.services import RecordService, ServiceSchemaWrapp
 from invenio_records_resources.services.base.links import LinksTemplate
 from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_records_resources.services.records.params import PaginationParam
-from invenio_records_resources.services.uow import (
-    RecordCommitOp,
-    RecordIndexOp,
-    unit_of_work,
-)
+from invenio_records_resources.services.uow import TaskOp, unit_of_work
 from invenio_search.engine import dsl
+from marshmallow import ValidationError
 
 from invenio_requests.customizations import CommentEventType
 from invenio_requests.customizations.event_types import LogEventType
@@ -34,7 +36,36 @@ from ...errors import (
     RequestLockedError,
 )
 from ...records.api import RequestEventFormat
+from ...records.loader import record_loader
+from ...records.models import RequestPendingNotificationModel
 from ...resolvers.registry import ResolverRegistry
+from ...tasks import send_comment_notifications_digest
+from ..uow import RequestBulkIndexOp, RequestEventCommitOp, RequestIndexOp
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_epoch_millis(dt):
+    """Convert a UTC datetime to the sort value of a date field."""
+    return (dt.replace(tzinfo=timezone.utc) - _EPOCH) // timedelta(milliseconds=1)
+
+
+def _encode_cursor(direction, sort_values):
+    """Encode an opaque timeline cursor."""
+    value = json.dumps({"d": direction, "s": sort_values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def _decode_cursor(cursor, directions=("next", "prev")):
+    """Decode a timeline cursor into its direction and sort values."""
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        direction, sort_values = value["d"], value["s"]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValidationError(_("Invalid cursor."), field_name="cursor")
+    if direction not in directions or not isinstance(sort_values, list):
+        raise ValidationError(_("Invalid cursor."), field_name="cursor")
+    return direction, sort_values
 
 
 class RequestEventsService(RecordService):
@@ -160,28 +191,22 @@ class RequestEventsService(RecordService):
         )
 
         # Persist record (DB and index)
-        uow.register(RecordCommitOp(event, indexer=self.indexer))
+        uow.register(RequestEventCommitOp(event, indexer=self.indexer))
+
+        # Keep track of the request's last reply
+        if event.type == CommentEventType:
+            request.update_last_reply(event)
+
+        # Keep track of the users participating in the request
+        request.add_participants([event["created_by"].get("user")])
 
         # Reindex the request to update events-related computed fields
-        # NOTE: We're not reindexing if the event is a deletion log event, since the
-        # associated request will anyways be deleted from the index. Ideally, instead of
-        # checking this here, the Unit of Work, should be able to optimize away the
-        # unecessary reindexing operations (i.e. if there's a RecordDeleteOp registered,
-        # all previous RecordIndexOps for the same record should be ignored).
-        is_delete_event = (
-            isinstance(event_type, LogEventType) or event_type is LogEventType
-        ) and (data.get("payload", {}).get("event") == "deleted")
-        if not is_delete_event:
-            uow.register(RecordIndexOp(request, indexer=requests_service.indexer))
+        # NOTE: The operation is coalesced with the other index operations of the
+        # request in the unit of work, and is skipped if the request is deleted.
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
 
         if notify and event_type is CommentEventType:
-            # Use different notification builder for replies vs top-level comments
-            if parent_id:
-                builder = request.type.reply_notification_builder
-            else:
-                builder = request.type.comment_notification_builder
-
-            uow.register(NotificationOp(builder.build(request, event)))
+            self._notify_comment(request, event, uow)
 
         return self.result_item(
             self,
@@ -196,10 +221,132 @@ class RequestEventsService(RecordService):
             request=request,
         )
 
+    @unit_of_work()
+    def create_many(self, identity, request_id, events, notify=False, uow=None):
+        """Create several request events at once (e.g. when importing requests).
+
+        The events are validated as a batch, inserted in the database together
+        and bulk indexed, and the request is reindexed once. Contrary to
+        ``create()``, the permissions are checked once per kind of event (i.e.
+        comment, reply or log) and not for each event's data.
+
+        :param request_id: Identifier of the request (data-layer id).
+        :param events: List of dictionaries with the ``data`` and the
+                       ``event_type`` of each event, and optionally the
+                       ``parent_id`` of a reply (which must already exist).
+        :param notify: Send the notifications of the created comments.
+        :returns: The IDs of the created events, in the given order.
+        """
+        request = self._get_request(request_id)
+        self.require_permission(identity, "read", request=request)
+
+        # Permissions, once per kind of event
+        permissions = set()
+        for event in events:
+            if event["event_type"].type_id != LogEventType.type_id:
+                permissions.add(
+                    "reply_comment" if event.get("parent_id") else "create_comment"
+                )
+        try:
+            for permission in sorted(permissions):
+                self.require_permission(identity, permission, request=request)
+        except PermissionDeniedError:
+            if current_app.config.get(
+                "REQUESTS_LOCKING_ENABLED", False
+            ) and request.get("is_locked", False):
+                raise RequestLockedError(
+                    description=_("Commenting is now locked for this conversation.")
+                )
+            raise RequestEventPermissionError(
+                description=_(
+                    "You do not have permission to comment on this conversation."
+                )
+            )
+
+        # Validate that the parents exist and are not replies themselves
+        parent_ids = {str(e["parent_id"]) for e in events if e.get("parent_id")}
+        parents = {}
+        if parent_ids:
+            parents = {
+                str(parent.id): parent
+                for parent in self.record_cls.get_records(
+                    list(parent_ids), with_deleted=True
+                )
+            }
+        for parent_id in parent_ids:
+            parent = parents.get(parent_id)
+            if parent is None or str(parent.request_id) != str(request.id):
+                raise ValidationError(
+                    _("The parent event does not exist."), field_name="parent_id"
+                )
+            if parent.parent_id is not None:
+                raise NestedChildrenNotAllowedError()
+
+        # Validate the data of all events, one schema per event type
+        schemas = {}
+        loaded = []
+        errors = {}
+        for idx, event in enumerate(events):
+            event_type = event["event_type"]
+            if event_type.type_id not in schemas:
+                schemas[event_type.type_id] = self._wrap_schema(
+                    event_type.marshmallow_schema()
+                )
+            try:
+                data, _errors = schemas[event_type.type_id].load(
+                    event["data"], context={"identity": identity}
+                )
+            except ValidationError as e:
+                errors[idx] = e.messages
+                continue
+            loaded.append((data, _errors))
+        if errors:
+            raise ValidationError(errors)
+
+        creator = self._get_creator(identity, request=request)
+        records = self.record_cls.create_many(
+            (
+                data,
+                dict(
+                    request=request.model,
+                    request_id=str(request.id),
+                    type=event["event_type"],
+                    created_by=creator,
+                    parent_id=event.get("parent_id"),
+                ),
+            )
+            for event, (data, _errors) in zip(events, loaded)
+        )
+
+        # Run components
+        for record, (data, _errors) in zip(records, loaded):
+            self.run_components(
+                "create", identity, data=data, event=record, errors=_errors, uow=uow
+            )
+
+        # Bulk index the events (the replies are routed to their parent)
+        bulk_op = RequestBulkIndexOp(self.indexer)
+        for record in records:
+            bulk_op.add(record)
+        uow.register(bulk_op)
+
+        # Keep track of the request's last reply, and reindex the request once
+        comments = [r for r in records if r.type == CommentEventType]
+        if comments:
+            request.update_last_reply(comments[-1])
+        if records:
+            request.add_participants([records[0]["created_by"].get("user")])
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
+
+        if notify:
+            for record in comments:
+                self._notify_comment(request, record, uow)
+
+        return [str(record.id) for record in records]
+
     def read(self, identity, id_, expand=False, **kwargs):
         """Retrieve a record."""
-        event = self._get_event(id_)
-        request = self._get_request(event.request_id)
+        event, request, _ = self._get_event_with_request(id_)
 
         self.require_permission(identity, "read", request=request, **kwargs)
 
@@ -221,8 +368,7 @@ class RequestEventsService(RecordService):
         self, identity, id_, data, revision_id=None, uow=None, expand=False, **kwargs
     ):
         """Update a comment (only comments can be updated)."""
-        event = self._get_event(id_)
-        request = self._get_request(event.request.id)
+        event, request, _ = self._get_event_with_request(id_)
         try:
             self.require_permission(
                 identity,
@@ -277,10 +423,10 @@ class RequestEventsService(RecordService):
             event["payload"]["files"] = data["payload"]["files"]
 
         # Persist record (DB and index)
-        uow.register(RecordCommitOp(event, indexer=self.indexer))
+        uow.register(RequestEventCommitOp(event, indexer=self.indexer))
 
         # Reindex the request to update events-related computed fields
-        uow.register(RecordIndexOp(request, indexer=requests_service.indexer))
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
 
         return self.result_item(
             self,
@@ -298,9 +444,8 @@ class RequestEventsService(RecordService):
     @unit_of_work()
     def delete(self, identity, id_, revision_id=None, uow=None, **kwargs):
         """Delete a comment (only comments can be deleted)."""
-        event = self._get_event(id_)
+        event, request, _ = self._get_event_with_request(id_)
         request_id = event.request_id
-        request = self._get_request(request_id)
 
         # Permissions
         self.require_permission(
@@ -348,10 +493,14 @@ class RequestEventsService(RecordService):
             event["payload"]["files"] = data["payload"]["files"]
 
         # Commit the updated comment
-        uow.register(RecordCommitOp(event, indexer=self.indexer))
+        uow.register(RequestEventCommitOp(event, indexer=self.indexer))
+
+        # The deleted comment might have been the request's last reply
+        if request.model.last_reply_id == event.id:
+            request.update_last_reply()
 
         # Reindex the request to update events-related computed fields
-        uow.register(RecordIndexOp(request, indexer=requests_service.indexer))
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
 
         return True
 
@@ -447,19 +596,7 @@ class RequestEventsService(RecordService):
         self.require_permission(identity, "read", request=request)
 
         # If a specific event ID is requested, we need to work out the corresponding page number.
-        focus_event = None
-        try:
-            focus_event = self._get_event(focus_event_id)
-            # Make sure the event belongs to the request, otherwise the `require_permission` call above
-            # might not be valid for this particular event.
-            if str(focus_event.request_id) != str(request_id):
-                raise PermissionDeniedError()
-
-            if focus_event.parent_id is not None:
-                focus_event = self._get_event(focus_event.parent_id)
-        except sqlalchemy.exc.NoResultFound:
-            # Silently ignore
-            pass
+        focus_event = self._get_focus_event(request, focus_event_id)
 
         params = {"sort": "oldest", "size": page_size}
 
@@ -510,6 +647,218 @@ class RequestEventsService(RecordService):
             request=request,
         )
 
+    def timeline(
+        self,
+        identity,
+        request_id,
+        size=None,
+        cursor=None,
+        focus_event_id=None,
+        expand=False,
+        search_preference=None,
+        preview_size=None,
+    ):
+        """Return a slice of the timeline of a request, paginated with cursors.
+
+        The top-level events are sorted from oldest to newest (by creation date
+        and ID) and paginated with ``search_after``, which is consistent under
+        concurrent writes and does not get slower for later slices.
+
+        :param size: Number of events in the slice (defaults to
+                     ``REQUESTS_TIMELINE_PAGE_SIZE``).
+        :param cursor: The ``next`` or ``prev`` cursor of a previous slice.
+        :param focus_event_id: If no cursor is given, start the slice at this
+                               event (or its parent, for a reply) instead of at
+                               the oldest event.
+        """
+        # Permissions - guarded by the request's can_read.
+        request = self._get_request(request_id)
+        self.require_permission(identity, "read", request=request)
+
+        if size is None:
+            size = current_app.config["REQUESTS_TIMELINE_PAGE_SIZE"]
+        if cursor is not None:
+            direction, search_after = _decode_cursor(cursor)
+        else:
+            direction, search_after = "next", None
+            focus_event = self._get_focus_event(request, focus_event_id)
+            if focus_event is not None:
+                # Anchor the slice right before the focused event
+                search_after = [_to_epoch_millis(focus_event.created), ""]
+
+        order = "asc" if direction == "next" else "desc"
+        parent_filter = dsl.Q(
+            "bool",
+            must=[dsl.Q("term", request_id=str(request.id))],
+            must_not=[dsl.Q("exists", field="parent_id")],  # Exclude replies
+            should=[self._timeline_query_child_preview(preview_size)],
+            minimum_should_match=0,
+        )
+        search = (
+            self._search(
+                "search",
+                identity,
+                {"size": size},
+                search_preference,
+                permission_action="unused",
+                extra_filter=parent_filter,
+                versioning=False,
+            ).sort({"created": order}, {"id": order})
+            # fetch one more event to know if there's a next slice
+            .extra(from_=0, size=size + 1)
+        )
+        if search_after is not None:
+            search = search.extra(search_after=search_after)
+
+        search_result = search.execute()
+        hits = list(search_result.hits)
+        has_more = len(hits) > size
+        hits = hits[:size]
+        if direction == "prev":
+            hits.reverse()
+
+        cursors = {"next": None, "prev": None}
+        if hits:
+            first, last = list(hits[0].meta.sort), list(hits[-1].meta.sort)
+            # There might be older events if we did not start from the oldest one
+            if direction == "next":
+                cursors["next"] = _encode_cursor("next", last) if has_more else None
+                if search_after is not None:
+                    cursors["prev"] = _encode_cursor("prev", first)
+            else:
+                cursors["next"] = _encode_cursor("next", last)
+                cursors["prev"] = _encode_cursor("prev", first) if has_more else None
+
+        return self.config.result_cursor_list_cls(
+            self,
+            identity,
+            hits,
+            None,
+            links_item_tpl=self.links_tpl_factory(
+                self.config.links_item, request=request, request_type=request.type
+            ),
+            expandable_fields=self.expandable_fields,
+            expand=expand,
+            request=request,
+            cursors=cursors,
+            total=search_result.hits.total["value"],
+        )
+
+    def search_since(
+        self,
+        identity,
+        request_id,
+        since_cursor=None,
+        size=None,
+        expand=False,
+        search_preference=None,
+    ):
+        """Return the events of a request created or updated since a cursor.
+
+        The events (top-level events and replies) are sorted by modification
+        date, so that polling clients only fetch the changes of the timeline.
+        The ``since`` cursor of the result is passed to the next call; if the
+        total is greater than the number of returned events, there are more
+        changes to fetch right away.
+
+        The entity tag of the result (see ``timeline_etag()``) is built from
+        the returned events, and not from the database: events which are not
+        searchable yet are thus returned by a later call.
+
+        Without a cursor, no events are returned, only the cursor of the
+        current state of the timeline.
+        """
+        # Permissions - guarded by the request's can_read.
+        request = self._get_request(request_id)
+        self.require_permission(identity, "read", request=request)
+
+        if size is None:
+            size = current_app.config["REQUESTS_TIMELINE_PAGE_SIZE"]
+        if since_cursor is not None:
+            _, search_after = _decode_cursor(since_cursor, directions=("since",))
+            order = "asc"
+        else:
+            # Only look up the most recently modified event
+            search_after, order, size = None, "desc", 1
+
+        search = (
+            self._search(
+                "search",
+                identity,
+                {"size": size},
+                search_preference,
+                permission_action="unused",
+                extra_filter=dsl.Q("term", request_id=str(request.id)),
+                versioning=False,
+            )
+            .sort({"updated": order}, {"id": order})
+            .extra(from_=0, size=size)
+        )
+        if search_after is not None:
+            search = search.extra(search_after=search_after)
+        search_result = search.execute()
+
+        hits = list(search_result.hits)
+        if hits:
+            cursor = _encode_cursor("since", list(hits[-1].meta.sort))
+        else:
+            cursor = since_cursor or _encode_cursor("since", [0, ""])
+        if since_cursor is None:
+            hits = []
+
+        return self.config.result_cursor_list_cls(
+            self,
+            identity,
+            hits,
+            None,
+            links_item_tpl=self.links_tpl_factory(
+                self.config.links_item, request=request, request_type=request.type
+            ),
+            expandable_fields=self.expandable_fields,
+            expand=expand,
+            request=request,
+            cursors={"since": cursor},
+            total=search_result.hits.total["value"] if since_cursor else 0,
+            etag=self._timeline_etag(request, cursor),
+        )
+
+    def timeline_etag(self, identity, request_id):
+        """Return an entity tag of the current state of a request's timeline.
+
+        The tag is made of the request's revision and of the ``since`` cursor of
+        the last modified event (i.e. a new or edited comment), read from the
+        database, so polling clients can cheaply check for changes before
+        fetching them. It matches the tag of a ``search_since()`` result only if
+        the result contains the last modified event.
+        """
+        request = self._get_request(request_id)
+        self.require_permission(identity, "read", request=request)
+
+        events = self.record_cls.model_cls.last_updated_events(request.id)
+        # same order as the search_since() sort
+        sort_values = max(
+            ([_to_epoch_millis(updated), str(id_)] for id_, updated in events),
+            default=[0, ""],
+        )
+        return self._timeline_etag(request, _encode_cursor("since", sort_values))
+
+    def _timeline_etag(self, request, since_cursor):
+        """Build the entity tag of a timeline from its ``since`` cursor."""
+        value = f"{request.revision_id}-{since_cursor}"
+        return hashlib.sha1(value.encode()).hexdigest()
+
+    def thread_participants(self, identity, request_id, parent_id):
+        """Return the IDs of the users participating in a comment thread.
+
+        The thread is made of the parent comment and its replies. The distinct
+        authors are selected by one query on the events table, instead of
+        reading the parent and scanning its replies in the search index.
+        """
+        request = self._get_request(request_id)
+        self.require_permission(identity, "read", request=request)
+
+        return self.record_cls.model_cls.thread_participants(request.id, parent_id)
+
     def scan(
         self,
         identity,
@@ -568,8 +917,7 @@ class RequestEventsService(RecordService):
         expand = kwargs.pop("expand", False)
 
         # Get the parent event to verify permissions and get request_id
-        parent_event = self._get_event(parent_id)
-        request = self._get_request(parent_event.request_id)
+        parent_event, request, _ = self._get_event_with_request(parent_id)
 
         # Permissions - guarded by the request's can_read
         self.require_permission(identity, "read", request=request)
@@ -627,8 +975,7 @@ class RequestEventsService(RecordService):
 
         Only searches reply comments (excludes parents comments/replies).
         """
-        parent_event = self._get_event(parent_id)
-        request = self._get_request(parent_event.request_id)
+        parent_event, request, _ = self._get_event_with_request(parent_id)
         # Permissions - guarded by the request's can_read.
         self.require_permission(identity, "read", request=request)
 
@@ -714,12 +1061,76 @@ class RequestEventsService(RecordService):
         # If it's already a request, return it
         if isinstance(request_id, self.request_cls):
             return request_id
-        return self.request_cls.get_record(request_id)
+        return record_loader.get(self.request_cls, request_id)
 
     def _get_event(self, event_id, with_deleted=True):
         """Get associated event_id."""
         return self.record_cls.get_record(event_id, with_deleted=with_deleted)
 
+    def _get_event_with_request(self, event_id, with_parent=False):
+        """Get an event and its request (and parent event) in a single query."""
+        event, request, parent = self.record_cls.get_record_with_request(
+            event_id,
+            with_deleted=True,
+            with_parent=with_parent,
+            request_cls=self.request_cls,
+        )
+        return event, record_loader.add(request), parent
+
+    def _get_focus_event(self, request, focus_event_id):
+        """Get the top-level event to focus on, if it exists.
+
+        For a reply, its parent is returned.
+        """
+        focus_event = None
+        try:
+            focus_event, _, parent_event = self._get_event_with_request(
+                focus_event_id, with_parent=True
+            )
+            # Make sure the event belongs to the request, otherwise the `require_permission` call above
+            # might not be valid for this particular event.
+            if str(focus_event.request_id) != str(request.id):
+                raise PermissionDeniedError()
+
+            if parent_event is not None:
+                focus_event = parent_event
+        except sqlalchemy.exc.NoResultFound:
+            # Silently ignore
+            pass
+        return focus_event
+
+    def _notify_comment(self, request, event, uow):
+        """Register the notification of a new comment (or reply).
+
+        If ``REQUESTS_COMMENT_NOTIFICATIONS_DIGEST_WINDOW`` is set, the
+        notification is added to the pending digest of the author's comments on
+        the request (or thread) instead, which is sent once the window ends.
+        """
+        window = current_app.config.get("REQUESTS_COMMENT_NOTIFICATIONS_DIGEST_WINDOW")
+        if not window:
+            # Use different notification builder for replies vs top-level comments
+            if event.parent_id:
+                builder = request.type.reply_notification_builder
+            else:
+                builder = request.type.comment_notification_builder
+            uow.register(NotificationOp(builder.build(request, event)))
+            return
+
+        key = hashlib.sha1(
+            json.dumps(
+                [str(request.id), str(event.parent_id or ""), event["created_by"]],
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+        RequestPendingNotificationModel.add(key, request.id, event.id)
+        # Each comment schedules the digest: the first task to run sends all the
+        # pending notifications, the following ones find none left.
+        uow.register(
+            TaskOp.for_async_apply(
+                send_comment_notifications_digest, args=(key,), countdown=window
+            )
+        )
+
     def _get_creator(self, identity, request=None):
         """Get the creator dict from the identity."""
         creator = None
@@ -12,6 +12,7 @@ from invenio_records_resources.services import FileService, ServiceSchemaWrapper
 from invenio_records_resources.services.base.links import LinksTemplate
 from invenio_records_resources.services.uow import RecordCommitOp, unit_of_work
 
+from invenio_requests.records.loader import record_loader
 from invenio_requests.services.files.errors import (
     RequestFileArgumentMissingError,
     RequestFileNotFoundError,
@@ -47,7 +48,7 @@ class RequestFilesService(FileService):
         Convenience method that combines init/upload/commit into one operation.
         """
         # Resolve and check permissions
-        request = self.request_cls.get_record(id_)
+        request = record_loader.get(self.request_cls, id_)
         self.require_permission(identity, "manage_files", request=request)
 
         # File size validation
@@ -94,7 +95,7 @@ class RequestFilesService(FileService):
             raise RequestFileArgumentMissingError()
 
         # Resolve and check permissions
-        request = self.request_cls.get_record(id_)
+        request = record_loader.get(self.request_cls, id_)
         self.require_permission(identity, "manage_files", request=request)
 
         if file_key is not None:
@@ -128,7 +129,7 @@ class RequestFilesService(FileService):
     def read_file(self, identity, id_, file_key):
         """Retrieve file content for download/display."""
         # Resolve and check permissions
-        request = self.request_cls.get_record(id_)
+        request = record_loader.get(self.request_cls, id_)
         self.require_permission(identity, "read_files", request=request)
 
         # Return file stream
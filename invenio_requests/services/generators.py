@@ -6,7 +6,7 @@
 """Request permissions."""
 
 import operator
-from functools import reduce
+from functools import lru_cache, reduce
 from itertools import chain
 
 from flask import current_app
@@ -18,6 +18,30 @@ from invenio_requests.customizations.event_types import LogEventType
 from invenio_requests.proxies import current_requests
 
 
+@lru_cache(maxsize=1024)
+def _grant_tokens(entity_field, needs, methods):
+    """Compute the grant tokens of a set of needs."""
+    return tuple(
+        EntityGrant(entity_field, need).token
+        for need in needs
+        if methods is None or need.method in methods
+    )
+
+
+def grant_tokens(identity, entity_field, methods=None):
+    """Get the grant tokens of an identity for an entity field.
+
+    The tokens are memoized per set of needs, so that they are not recomputed
+    for each search of an identity (with possibly hundreds of needs).
+
+    :param methods: Optional need methods (e.g. ``{"id", "role"}``) to restrict
+                    the tokens to.
+    """
+    if methods is not None:
+        methods = frozenset(methods)
+    return list(_grant_tokens(entity_field, frozenset(identity.provides), methods))
+
+
 class Status(Generator):
     """Generator to validate needs only for a given request status."""
 
@@ -61,9 +85,7 @@ class EntityNeedsGenerator(Generator):
 
     def query_filter(self, identity=None, **kwargs):
         """Query filters for the current identity."""
-        grants = []
-        for need in identity.provides:
-            grants.append(EntityGrant(self.entity_field, need).token)
+        grants = grant_tokens(identity, self.entity_field)
         if grants:
             return dsl.Q("terms", **{self.grants_field: grants})
         return None
@@ -119,33 +141,47 @@ class Topic(EntityNeedsGenerator):
         granting unintended access based on their topic, as they may not have
         the necessary logic to determine entity-specific permissions.
         """
-        # Exclude request types that do NOT define `resolve_topic_needs`
-        excluded_request_types = [
-            ~dsl.Q("term", **{"type": _type.type_id})
-            for _type in current_requests.request_type_registry
-            if not getattr(_type, "resolve_topic_needs")
-        ]
-
         # Generate grant tokens based on the user's identity
-        grant_tokens = [
-            EntityGrant(self.entity_field, need).token for need in identity.provides
-        ]
+        grants = grant_tokens(identity, self.entity_field)
 
         # If the user has no grant tokens, there is no need to proceed
-        if not grant_tokens:
+        if not grants:
             return None
 
         # Build the final query
         query = dsl.Q(
             "bool",
             must=[
-                dsl.Q("terms", **{self.grants_field: grant_tokens}),
-                dsl.Q("bool", must=excluded_request_types),
+                dsl.Q("terms", **{self.grants_field: grants}),
+                self._excluded_request_types_query(),
             ],
         )
 
         return query
 
+    def _excluded_request_types_query(self):
+        """Query excluding request types without `resolve_topic_needs`.
+
+        The query is cached until the registered request types change.
+        """
+        registry = current_requests.request_type_registry
+        cached = getattr(self, "_excluded_types_cache", None)
+        if (
+            cached is not None
+            and cached[0] is registry
+            and cached[1] == registry.version
+        ):
+            return cached[2]
+
+        excluded_request_types = [
+            ~dsl.Q("term", **{"type": _type.type_id})
+            for _type in registry
+            if not getattr(_type, "resolve_topic_needs")
+        ]
+        query = dsl.Q("bool", must=excluded_request_types)
+        self._excluded_types_cache = (registry, registry.version, query)
+        return query
+
 
 class Reviewers(EntityNeedsGenerator):
     """Allows the reviewer of the request."""
@@ -172,9 +208,7 @@ class Reviewers(EntityNeedsGenerator):
         if not self._reviewers_enabled():
             return None
 
-        grants = []
-        for need in identity.provides:
-            grants.append(EntityGrant(self.entity_field, need).token)
+        grants = grant_tokens(identity, self.entity_field)
         if grants:
             return dsl.Q("terms", **{self.grants_field: grants})
         return None
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Indexers for requests and request events."""
+
+from flask import current_app
+from invenio_db import db
+from invenio_indexer.api import RecordIndexer
+from invenio_search.engine import search
+from sqlalchemy import inspect
+
+
+class BulkRecordIndexer(RecordIndexer):
+    """Record indexer able to bulk index already loaded records.
+
+    Contrary to ``bulk_index()``, which sends record IDs to the indexing queue
+    (and loads every record again when consuming it), the records are dumped
+    and sent to the search engine directly.
+    """
+
+    def index_records(self, records, **kwargs):
+        """Bulk index the given records.
+
+        :param records: Iterable of records to index.
+        :param kwargs: Passed to the search engine's bulk helper.
+        :returns: Tuple with the number of indexed records and failed records.
+        """
+        records = list(records)
+        self._refresh_models(records)
+        return search.helpers.bulk(
+            self.client,
+            (self._record_index_action(record) for record in records),
+            stats_only=True,
+            request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+            expand_action_callback=search.helpers.expand_action,
+            **kwargs,
+        )
+
+    def _refresh_models(self, records, chunk_size=1000):
+        """Load the expired models of the records (e.g. after a commit) in bulk.
+
+        Otherwise, each model would be refreshed with its own query when dumped.
+        """
+        expired = {}
+        for record in records:
+            if record.model is not None and inspect(record.model).expired:
+                model_cls = type(record.model)
+                expired.setdefault(model_cls, []).append(record.model)
+
+        for model_cls, models in expired.items():
+            ids = [inspect(model).identity[0] for model in models]
+            for i in range(0, len(ids), chunk_size):
+                db.session.query(model_cls).filter(
+                    model_cls.id.in_(ids[i : i + chunk_size])
+                ).all()
+
+    def _record_index_action(self, record):
+        """Bulk index action for a loaded record."""
+        index = self.record_to_index(record)
+
+        arguments = {}
+        body = self._prepare_record(record, index, arguments)
+        index = self._prepare_index(index)
+
+        action = {
+            "_op_type": "index",
+            "_index": index,
+            "_id": str(record.id),
+            "_version": record.revision_id,
+            "_version_type": self._version_type,
+            "_source": body,
+        }
+        action.update(arguments)
+
+        return action
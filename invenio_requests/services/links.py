@@ -4,12 +4,122 @@
 
 """Utility for rendering URI template links."""
 
-import copy
+import re
+from urllib.parse import quote
+from uuid import UUID
 
+from flask import current_app
+from invenio_base import invenio_url_for
 from invenio_records_resources.services import EndpointLink
 
+PATH_SAFE_CHARS = "!$&'()*+,/:;=@"
+"""Characters not escaped in the URL path (as by werkzeug's URL converters)."""
 
-class RequestEndpointLink(EndpointLink):
+ANCHOR_SAFE_CHARS = "%!#$&'()*+,/:;=?@"
+"""Characters not escaped in the URL anchor (as by ``invenio_url_for``)."""
+
+
+class URLTemplate:
+    """URL of an endpoint, compiled into a template.
+
+    Building a URL with ``invenio_url_for`` looks up the URL rules of the
+    endpoint and runs their converters, for each link of each result. Instead,
+    the URL is built once with placeholder values, and the link values are then
+    substituted to the placeholders (escaped as by werkzeug's default
+    converter, which gives the same result as the ``uuid`` converter for UUIDs).
+    """
+
+    placeholder_re = re.compile(r"(requestslinkparam\d+x)")
+
+    def __init__(self, parts):
+        """Constructor.
+
+        :param parts: The literal parts of the URL, interleaved with the names
+                      of the parameters.
+        """
+        self.parts = parts
+
+    @classmethod
+    def compile(cls, endpoint, params):
+        """Compile the URL of an endpoint.
+
+        :returns: The template, or ``None`` if the URL can't be compiled.
+        """
+        placeholders = {f"requestslinkparam{i}x": p for i, p in enumerate(params)}
+        url = invenio_url_for(endpoint, **{v: k for k, v in placeholders.items()})
+        parts = cls.placeholder_re.split(url)
+        names = parts[1::2]
+        if sorted(names) != sorted(placeholders):
+            # e.g. a placeholder altered by a URL converter
+            return None
+        parts[1::2] = [placeholders[name] for name in names]
+        return cls(parts)
+
+    def expand(self, values, anchor=None):
+        """Expand the URL with the given values."""
+        parts = self.parts[:]
+        for i in range(1, len(parts), 2):
+            value = values[parts[i]]
+            # UUIDs have nothing to escape
+            parts[i] = (
+                str(value)
+                if isinstance(value, UUID)
+                else quote(str(value), safe=PATH_SAFE_CHARS)
+            )
+        if anchor is not None:
+            parts.append("#" + quote(anchor, safe=ANCHOR_SAFE_CHARS))
+        return "".join(parts)
+
+
+def url_template(endpoint, params):
+    """Get the compiled URL template of an endpoint, once per application.
+
+    :param params: The (sorted) names of the URL parameters.
+    :returns: The template, or ``None`` if the URL can't be compiled.
+    """
+    app = current_app._get_current_object()
+    config = app.config
+    key = (endpoint, params, config.get("SITE_UI_URL"), config.get("SITE_API_URL"))
+    templates = app.extensions["invenio-requests"].url_templates
+    if key not in templates:
+        templates[key] = URLTemplate.compile(endpoint, params)
+    return templates[key]
+
+
+def expand_endpoint_link(link, obj, context):
+    """Expand an ``EndpointLink`` with the compiled URL of its endpoint.
+
+    Same as ``EndpointLink.expand()``, which is used as a fallback for the
+    links with querystring arguments (from the context, or added by the vars
+    of the link) and the URLs which can't be compiled.
+    """
+    vars = context.copy()
+    if context.get("args"):
+        vars["args"] = context["args"].copy()
+    link.vars(obj, vars)
+    if link._vars_func:
+        link._vars_func(obj, vars)
+
+    if vars.get("args"):
+        return EndpointLink.expand(link, obj, context)
+
+    # as ``invenio_url_for``, the parameters without value are left out
+    values = {k: v for k, v in vars.items() if k in link._params and v is not None}
+    template = url_template(link._endpoint, tuple(sorted(values)))
+    if template is None:
+        return EndpointLink.expand(link, obj, context)
+    return template.expand(values, anchor=link._anchor_func(obj, vars))
+
+
+class CompiledEndpointLink(EndpointLink):
+    """Endpoint link expanded with the compiled URL of its endpoint."""
+
+    def expand(self, obj, context):
+        """Expand the endpoint."""
+        return expand_endpoint_link(self, obj, context)
+
+
+class RequestEndpointLink(CompiledEndpointLink):
     """Shortcut for writing request links."""
 
     def __init__(self, *args, **kwargs):
@@ -65,7 +175,7 @@ class RequestTypeDependentEndpointLink(EndpointLink):
         "request_event" that an EndpointLink defined on a RequestType can
         and should rely on.
         """
-        ctx = copy.deepcopy(context)
+        ctx = context.copy()
         ctx["request"] = self._request_retriever(obj, ctx)
         ctx["request_type"] = self._request_type_retriever(obj, ctx)
         ctx["request_event"] = self._request_event_retriever(obj, ctx)
@@ -100,10 +210,13 @@ class RequestTypeDependentEndpointLink(EndpointLink):
         endpoint_link = self._retrieve_endpoint_link(obj, ctx)
         if hasattr(endpoint_link, "set_anchor"):
             endpoint_link.set_anchor(self._anchor_func)
+        if type(endpoint_link).expand is EndpointLink.expand:
+            # e.g. the links defined by the request types
+            return expand_endpoint_link(endpoint_link, obj, ctx)
         return endpoint_link.expand(obj, ctx)
 
 
-class RequestListOfCommentsEndpointLink(EndpointLink):
+class RequestListOfCommentsEndpointLink(CompiledEndpointLink):
     """Render links for a Request's Comments (Events).
 
     Note that the RequestCommentsResource uses RequestEventsService.
@@ -121,7 +234,7 @@ class RequestListOfCommentsEndpointLink(EndpointLink):
         vars.update({"request_id": record.id})
 
 
-class RequestSingleCommentEndpointLink(EndpointLink):
+class RequestSingleCommentEndpointLink(CompiledEndpointLink):
     """Render links for a Request's Comment (Event)."""
 
     def __init__(self, *args, **kwargs):
@@ -163,10 +276,14 @@ class ActionsEndpointLinks:
         """
         links = {}
         request = obj
+        # set by the service to share the evaluation across requests
+        evaluator = context.get("actions_evaluator")
 
         for action in request.type.available_actions:
             if action in [request.type.create_action, request.type.delete_action]:
                 continue
+            if evaluator is not None and not evaluator.can_execute(request, action):
+                continue
             ctx = context.copy()
             ctx["action"] = action
             if self._endpoint_link.should_render(request, ctx):
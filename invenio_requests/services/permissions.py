@@ -6,11 +6,16 @@
 
 """Request permissions."""
 
+import json
+from copy import copy
+from itertools import chain
+
 from invenio_administration.generators import Administration
 from invenio_records_permissions import RecordPermissionPolicy
 from invenio_records_permissions.generators import (
     AnyUser,
     AuthenticatedUser,
+    ConditionalGenerator,
     Disable,
     IfConfig,
     SameAs,
@@ -18,11 +23,121 @@ from invenio_records_permissions.generators import (
     SystemProcessWithoutSuperUser,
 )
 
+from ..cache import RequestScopedCache
+from ..proxies import current_requests
 from .generators import Commenter, Creator, IfLocked, Receiver, Reviewers, Status, Topic
 
+permission_needs_cache = RequestScopedCache(
+    "permission_needs", maxsize="REQUESTS_PERMISSION_NEEDS_CACHE_MAXSIZE"
+)
+"""Cache of the needs/excludes of permissions on requests and events."""
+
+
+def _config_conditions(policy_cls, generators):
+    """Get the ``IfConfig`` generators of a generator tree."""
+    for generator in generators:
+        if isinstance(generator, SameAs):
+            yield from _config_conditions(
+                policy_cls, getattr(policy_cls, generator._delegated_permission_name)
+            )
+        elif isinstance(generator, ConditionalGenerator):
+            if isinstance(generator, IfConfig):
+                yield generator
+            yield from _config_conditions(policy_cls, generator.then_)
+            yield from _config_conditions(policy_cls, generator.else_)
+
+
+def _compile(policy_cls, generators):
+    """Compile a generator tree.
+
+    The ``IfConfig`` generators are replaced by the generators of their branch
+    for the current config, and the ``SameAs`` generators by the (compiled)
+    generators they refer to. The other conditional generators are kept, with
+    compiled branches.
+    """
+    compiled = []
+    for generator in generators:
+        if isinstance(generator, SameAs):
+            compiled.extend(
+                _compile(
+                    policy_cls,
+                    getattr(policy_cls, generator._delegated_permission_name),
+                )
+            )
+        elif isinstance(generator, IfConfig):
+            branch = generator.then_ if generator._condition() else generator.else_
+            compiled.extend(_compile(policy_cls, branch))
+        elif isinstance(generator, ConditionalGenerator):
+            generator = copy(generator)
+            generator.then_ = _compile(policy_cls, generator.then_)
+            generator.else_ = _compile(policy_cls, generator.else_)
+            compiled.append(generator)
+        else:
+            compiled.append(generator)
+    return compiled
+
+
+def compiled_generators(policy_cls, action):
+    """Get the compiled generator tree of an action of a policy.
+
+    The tree is compiled once per policy, action and outcome of its ``IfConfig``
+    conditions (which are re-evaluated on each call, as the config can change),
+    and kept by the extension of the current application.
+
+    :returns: A tuple of the outcomes of the ``IfConfig`` conditions and the
+              list of compiled generators.
+    """
+    cache = current_requests.compiled_generators
+    key = (policy_cls, action)
+    if key not in cache:
+        generators = getattr(policy_cls, "can_" + action, [Disable()])
+        cache[key] = (
+            generators,
+            list(_config_conditions(policy_cls, generators)),
+            {},
+        )
+    generators, conditions, compiled = cache[key]
+
+    outcomes = tuple(condition._condition() for condition in conditions)
+    if outcomes not in compiled:
+        compiled[outcomes] = _compile(policy_cls, generators)
+    return outcomes, compiled[outcomes]
+
 
 class PermissionPolicy(RecordPermissionPolicy):
-    """Permission policy."""
+    """Permission policy.
+
+    The needs and excludes are computed from compiled generator trees (see
+    ``compiled_generators``), and cached per action, request and event
+    revision (and state, see ``cache_key_fields``) within an HTTP request or
+    task.
+    """
+
+    cacheable_context = ("request", "event", "identity", "permission_policy")
+    """Context arguments supported by the needs cache.
+
+    The needs do not depend on the identity; permissions checked with other
+    context arguments are not cached.
+    """
+
+    cache_key_fields = {
+        "request": (
+            "type",
+            "status",
+            "is_locked",
+            "created_by",
+            "receiver",
+            "topic",
+            "reviewers",
+        ),
+        "event": ("type", "created_by"),
+    }
+    """Fields of the requests and events read by the generators.
+
+    They are part of the key of the needs cache, along with the revision, as
+    the records can be modified in memory before the changes are committed.
+    Policies with generators reading other fields must extend them.
+    """
 
     # Ability in general to create requests (not which request you can create)
     can_create = [AuthenticatedUser(), SystemProcess()]
@@ -133,3 +248,59 @@ class PermissionPolicy(RecordPermissionPolicy):
 
     # Read (View/Download) files: Same permission as viewing the request and its timeline.
     can_read_files = can_read
+
+    def _cache_key(self, outcomes):
+        """Key of the needs cache, or ``None`` if the permission is not cacheable."""
+        if not set(self.over) <= set(self.cacheable_context):
+            return None
+
+        if self.over.get("request") is None:
+            return None
+
+        key = [type(self), self.action, outcomes]
+        for name in ("request", "event"):
+            obj = self.over.get(name)
+            if obj is None:
+                key.append(None)
+                continue
+            revision_id = getattr(obj, "revision_id", None)
+            if getattr(obj, "id", None) is None or revision_id is None:
+                return None
+            state = json.dumps(
+                {field: obj.get(field) for field in self.cache_key_fields[name]},
+                sort_keys=True,
+                default=str,
+            )
+            key.append((obj.id, revision_id, state))
+        return tuple(key)
+
+    _evaluated = None
+
+    def _evaluate(self):
+        """Compute the needs and excludes from the compiled generators."""
+        outcomes, generators = compiled_generators(type(self), self.action)
+
+        def factory():
+            for generator in generators:
+                self.explicit_needs |= set(generator.needs(**self.over))
+                self.explicit_excludes |= set(generator.excludes(**self.over))
+            self._load_permissions()
+            return self._permissions.needs, self._permissions.excludes
+
+        if self._evaluated is None:
+            key = self._cache_key(outcomes)
+            if key is None:
+                self._evaluated = factory()
+            else:
+                self._evaluated = permission_needs_cache.get(key, factory)
+        return self._evaluated
+
+    @property
+    def needs(self):
+        """Set of Needs granting permission."""
+        return self._evaluate()[0]
+
+    @property
+    def excludes(self):
+        """Set of Needs denying permission."""
+        return self._evaluate()[1]
@@ -218,6 +218,8 @@ class RequestCommentFileValidationComponent(ServiceComponent):
             UUID(file_next["file_id"])
             for file_next in data.get("payload", {}).get("files", [])
         ]
+        if not comment_file_ids_next:
+            return
 
         # Retrieve the existing (persisted) list of files with the given file IDs which are associated to the request.
         request_files_existing = RequestFile.list_by_file_ids(
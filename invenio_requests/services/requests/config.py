@@ -21,6 +21,7 @@ from invenio_requests.services.requests import facets
 
 from ...customizations import RequestActions
 from ...records.api import Request
+from ..indexer import BulkRecordIndexer
 from ..links import (
     ActionsEndpointLinks,
     RequestEndpointLink,
@@ -44,6 +45,9 @@ def _is_action_available(request, context):
     """Check if the given action is available on the request."""
     action = context.get("action")
     identity = context.get("identity")
+    evaluator = context.get("actions_evaluator")
+    if evaluator is not None:
+        return evaluator.is_available(identity, request, action)
     permission_policy_cls = context.get("permission_policy_cls")
     permission = permission_policy_cls(f"action_{action}", request=request)
     return RequestActions.can_execute(request, action) and permission.allows(identity)
@@ -102,6 +106,7 @@ class RequestsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     # request-specific configuration
     record_cls = Request  # needed for model queries
     schema = None  # stored in the API classes, for customization
+    indexer_cls = BulkRecordIndexer
     indexer_queue_name = "requests"
     index_dumper = None
 
@@ -5,7 +5,6 @@
 
 from functools import partial
 
-from invenio_records_resources.references import EntityGrant
 from invenio_records_resources.services.records.params import (
     FilterParam,
     ParamInterpreter,
@@ -13,6 +12,7 @@ from invenio_records_resources.services.records.params import (
 from invenio_search.engine import dsl
 
 from ...resolvers.registry import ResolverRegistry
+from ..generators import grant_tokens
 
 
 class ReferenceFilterParam(FilterParam):
@@ -103,21 +103,9 @@ class SharedOrMyRequestsParam(ParamInterpreter):
         The query will return requests shared with the user via the topic grants (only via user or group).
         """
         allowed_need_methods = {"id", "role"}
-        topic_grants = [
-            EntityGrant("topic", need).token
-            for need in identity.provides
-            if need.method in allowed_need_methods
-        ]
-        receiver_grants = [
-            EntityGrant("receiver", need).token
-            for need in identity.provides
-            if need.method in allowed_need_methods
-        ]
-        reviewer_grants = [
-            EntityGrant("reviewers", need).token
-            for need in identity.provides
-            if need.method in allowed_need_methods
-        ]
+        topic_grants = grant_tokens(identity, "topic", allowed_need_methods)
+        receiver_grants = grant_tokens(identity, "receiver", allowed_need_methods)
+        reviewer_grants = grant_tokens(identity, "reviewers", allowed_need_methods)
         my_requests_query = self._generate_my_requests_query(identity)
         # Topic grants include requests created by the user or the user is the receiver,
         # so we need to exclude them
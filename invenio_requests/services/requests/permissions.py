@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Batched evaluation of the availability of the actions on requests."""
+
+from ...customizations import RequestActions
+
+
+class ActionsAvailabilityEvaluator:
+    """Evaluate the availability of the actions on many requests.
+
+    Whether an action is available on a request depends on the request's type
+    and status (i.e. the state machine of the type), and through the permission
+    policy on the request's entities (creator, receiver, topic and reviewers)
+    and on whether it is locked. The state machine is thus evaluated once per
+    (type, status) pair, and the permissions once per distinct (type, status,
+    entities) signature, instead of once per request and action (e.g. for all
+    the hits of a search results page).
+
+    The evaluator is opt-in (see ``REQUESTS_ACTIONS_BATCH_PERMISSIONS``), as it
+    must not be used with actions and policies depending on other properties
+    of the requests.
+    """
+
+    def __init__(self, permission_policy_cls):
+        """Constructor."""
+        self._permission_policy_cls = permission_policy_cls
+        self._executable = {}
+        self._allowed = {}
+        self._identity = None
+
+    @staticmethod
+    def _entities_key(request):
+        """Key of the properties of a request the permissions depend on."""
+        return (
+            request.get("is_locked", False),
+            tuple(sorted((request.get("created_by") or {}).items())),
+            tuple(sorted((request.get("receiver") or {}).items())),
+            tuple(sorted((request.get("topic") or {}).items())),
+            tuple(
+                tuple(sorted(reviewer.items()))
+                for reviewer in request.get("reviewers") or []
+            ),
+        )
+
+    def can_execute(self, request, action):
+        """Check if the state machine of the request allows the action."""
+        key = (request.type.type_id, request.status, action)
+        if key not in self._executable:
+            self._executable[key] = RequestActions.can_execute(request, action)
+        return self._executable[key]
+
+    def is_available(self, identity, request, action):
+        """Check if the action is available on the request for the identity."""
+        if identity is not self._identity:
+            self._identity = identity
+            self._allowed.clear()
+
+        if not self.can_execute(request, action):
+            return False
+
+        key = (
+            request.type.type_id,
+            request.status,
+            action,
+            self._entities_key(request),
+        )
+        if key not in self._allowed:
+            permission = self._permission_policy_cls(
+                f"action_{action}", request=request
+            )
+            self._allowed[key] = permission.allows(identity)
+        return self._allowed[key]
@@ -5,11 +5,9 @@
 
 """Results for the requests service."""
 
-from invenio_records_resources.services.records.results import (
-    MultiFieldsResolver,
-    RecordItem,
-    RecordList,
-)
+from invenio_records_resources.services.records.results import RecordItem, RecordList
+
+from ..results import CachedFieldsResolver
 
 
 class RequestItem(RecordItem):
@@ -35,7 +33,7 @@ class RequestItem(RecordItem):
         self._service = service
         self._links_tpl = links_tpl
         self._schema = schema or service._wrap_schema(request.type.marshmallow_schema())
-        self._fields_resolver = MultiFieldsResolver(expandable_fields)
+        self._fields_resolver = CachedFieldsResolver(expandable_fields)
         self._expand = expand
 
     @property
@@ -145,18 +143,24 @@ class RequestList(RecordList):
         self._params = params
         self._links_tpl = links_tpl
         self._links_item_tpl = links_item_tpl
-        self._fields_resolver = MultiFieldsResolver(expandable_fields)
+        self._fields_resolver = CachedFieldsResolver(expandable_fields)
         self._expand = expand
 
     @property
     def hits(self):
         """Iterator over the hits."""
         request_cls = self._service.record_cls
+        # One (wrapped) schema per request type for the whole page, instantiating
+        # a schema is costly
+        schemas = {}
 
         for hit in self._results:
             # load dump
             request = request_cls.loads(hit.to_dict())
-            schema = self._service._wrap_schema(request.type.marshmallow_schema())
+            schema = schemas.get(request.type.type_id)
+            if schema is None:
+                schema = self._service._wrap_schema(request.type.marshmallow_schema())
+                schemas[request.type.type_id] = schema
 
             # project the request
             projection = schema.dump(
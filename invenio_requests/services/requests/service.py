@@ -6,23 +6,36 @@
 
 """Requests service."""
 
+from flask import current_app
+from invenio_db import db
 from invenio_i18n import lazy_gettext as _
 from invenio_records_resources.services import RecordService, ServiceSchemaWrapper
 from invenio_records_resources.services.base import LinksTemplate
+from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_records_resources.services.uow import (
     IndexRefreshOp,
-    RecordCommitOp,
     RecordDeleteOp,
+    UnitOfWork,
     unit_of_work,
 )
 from invenio_search.engine import dsl
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import NoResultFound
 
 from ...customizations import RequestActions
 from ...customizations.event_types import CommentEventType
-from ...errors import CannotExecuteActionError, RequestLockedError
+from ...errors import (
+    CannotExecuteActionError,
+    NoSuchActionError,
+    RequestLockedError,
+)
 from ...proxies import current_events_service, current_request_type_registry
+from ...records.loader import record_loader
+from ...records.models import RequestNumber
 from ...resolvers.registry import ResolverRegistry
 from ..results import EntityResolverExpandableField, MultiEntityResolverExpandableField
+from ..uow import RequestBulkIndexOp, RequestCommitOp, merge_index_refresh
+from .permissions import ActionsAvailabilityEvaluator
 
 
 class RequestsService(RecordService):
@@ -31,12 +44,14 @@ class RequestsService(RecordService):
     @property
     def links_item_tpl(self):
         """Item links template."""
-        return LinksTemplate(
-            self.config.links_item,
-            context={
-                "permission_policy_cls": self.config.permission_policy_cls,
-            },
-        )
+        context = {"permission_policy_cls": self.config.permission_policy_cls}
+        if current_app.config["REQUESTS_ACTIONS_BATCH_PERMISSIONS"]:
+            # shared by all the requests whose links are expanded with the
+            # template, e.g. the hits of a search results page
+            context["actions_evaluator"] = ActionsAvailabilityEvaluator(
+                self.config.permission_policy_cls
+            )
+        return LinksTemplate(self.config.links_item, context=context)
 
     @property
     def request_type_registry(self):
@@ -130,7 +145,7 @@ class RequestsService(RecordService):
         self._execute(identity, request, request_type.create_action, uow)
 
         # persist record (DB and index)
-        uow.register(RecordCommitOp(request, indexer=self.indexer))
+        uow.register(RequestCommitOp(request, indexer=self.indexer))
 
         return self.result_item(
             self,
@@ -143,10 +158,194 @@ class RequestsService(RecordService):
             expand=expand,
         )
 
+    def create_many(
+        self, identity, requests, chunk_size=None, dry_run=False, refresh=False
+    ):
+        """Create many requests, e.g. to import them from another system.
+
+        The requests are processed in chunks of ``chunk_size`` requests. The
+        permissions, data and entity references of all the requests of a chunk
+        are checked first. The numbers of the valid requests are then reserved
+        in one statement, and the requests are inserted by a single multi-row
+        insert in one transaction, followed by one bulk index. If the creation
+        fails for a request of a chunk (e.g. in a component), the chunk is
+        rolled back and its requests are created one by one instead. Indexing
+        errors, which happen after the commit, are only logged: the requests
+        are created, and can be reindexed.
+
+        :param requests: List of dicts with the arguments of ``create()`` for
+                         each request, i.e. ``data``, ``request_type``,
+                         ``receiver`` and optionally ``creator``, ``topic`` and
+                         ``expires_at``.
+        :param chunk_size: Number of requests per transaction (defaults to
+                           ``REQUESTS_BULK_CREATE_CHUNK_SIZE``).
+        :param dry_run: If ``True``, the requests are only checked, nothing is
+                        written to the database or indexed.
+        :param refresh: Index refresh mode per chunk (``True``, ``"wait_for"``
+                        or ``False``).
+        :returns: A list with, for each request, the ID of the created request
+                  (``None`` for a valid request in dry-run mode), or the error
+                  raised otherwise.
+        """
+        chunk_size = chunk_size or current_app.config["REQUESTS_BULK_CREATE_CHUNK_SIZE"]
+        requests = list(requests)
+
+        results = []
+        for i in range(0, len(requests), chunk_size):
+            results.extend(
+                self._create_chunk(
+                    identity,
+                    requests[i : i + chunk_size],
+                    dry_run=dry_run,
+                    refresh=refresh,
+                )
+            )
+        return results
+
+    def _prepare_create(
+        self,
+        identity,
+        data,
+        request_type,
+        receiver,
+        creator=None,
+        topic=None,
+        expires_at=None,
+        **kwargs,
+    ):
+        """Check and load the arguments of a request to create."""
+        self.require_permission(
+            identity,
+            "create",
+            data=data,
+            request_type=request_type,
+            receiver=receiver,
+            creator=creator,
+            record=topic,
+            expires_at=expires_at,
+            **kwargs,
+        )
+
+        schema = self._wrap_schema(request_type.marshmallow_schema())
+        data, _ = schema.load(data, context={"identity": identity})
+
+        creator = (
+            ResolverRegistry.reference_entity(creator, raise_=True)
+            if creator is not None
+            else ResolverRegistry.reference_identity(identity)
+        )
+        if topic is not None:
+            topic = ResolverRegistry.reference_entity(topic, raise_=True)
+        if receiver is not None:
+            receiver = ResolverRegistry.reference_entity(receiver, raise_=True)
+
+        return dict(
+            data=data,
+            request_type=request_type,
+            expires_at=expires_at,
+            created_by=creator,
+            topic=topic,
+            receiver=receiver,
+        )
+
+    def _create_chunk(self, identity, requests, dry_run=False, refresh=False):
+        """Create a chunk of requests, in one transaction."""
+        results = [None] * len(requests)
+
+        valid = []
+        for idx, kwargs in enumerate(requests):
+            try:
+                valid.append((idx, self._prepare_create(identity, **kwargs)))
+            except Exception as e:
+                results[idx] = e
+
+        if dry_run or not valid:
+            return results
+
+        uow = UnitOfWork()
+        try:
+            with uow, db.session.no_autoflush:
+                # the requests and events are bulk indexed after the commit
+                bulk_op = RequestBulkIndexOp(self.indexer, raise_on_error=False)
+                uow.register(bulk_op)
+                uow.register(
+                    RequestBulkIndexOp(
+                        current_events_service.indexer, raise_on_error=False
+                    )
+                )
+
+                numbers = RequestNumber.next_many(len(valid))
+                created = []
+                for (idx, prepared), number in zip(valid, numbers):
+                    request_type = prepared["request_type"]
+                    request = self.record_cls.build(
+                        {}, type=request_type, expires_at=prepared["expires_at"]
+                    )
+                    type(request).number.assign(request, sequence_value=number)
+                    # e.g. log events created by the create action load the request
+                    record_loader.add(request)
+
+                    self.run_components(
+                        "create",
+                        identity,
+                        data=prepared["data"],
+                        record=request,
+                        errors=[],
+                        created_by=prepared["created_by"],
+                        topic=prepared["topic"],
+                        receiver=prepared["receiver"],
+                        uow=uow,
+                    )
+                    self._execute(identity, request, request_type.create_action, uow)
+                    created.append((idx, request))
+
+                self.record_cls.insert_many([request for _, request in created])
+                for _, request in created:
+                    bulk_op.add(
+                        request,
+                        index_refresh="wait_for" if refresh == "wait_for" else False,
+                    )
+                if refresh is True:
+                    uow.register(IndexRefreshOp(indexer=self.indexer))
+                # Only the errors up to the database commit fall back to creating
+                # each request separately, the requests exist afterwards.
+                uow.session.commit()
+        except Exception:
+            current_app.logger.warning(
+                "Failed to create a chunk of requests, creating each request "
+                "separately.",
+                exc_info=True,
+            )
+            for idx, _ in valid:
+                try:
+                    results[idx] = str(self.create(identity, **requests[idx]).id)
+                except Exception as e:
+                    results[idx] = e
+            return results
+
+        self._commit_chunk(uow, "create a chunk of requests")
+        for idx, request in created:
+            results[idx] = str(request.id)
+        return results
+
+    def _commit_chunk(self, uow, description):
+        """Run the (post-)commit operations of a chunk already committed.
+
+        The changes are in the database at this point, so that the errors (e.g.
+        of the bulk indexing, or sending notifications) are logged, and left to
+        a reindex, instead of being raised.
+        """
+        try:
+            uow.commit()
+        except Exception:
+            current_app.logger.exception(
+                f"Failed to index or notify after committing {description}."
+            )
+
     def read(self, identity, id_, expand=False, **kwargs):
         """Retrieve a request."""
         # resolve and require permission
-        request = self.record_cls.get_record(id_)
+        request = record_loader.get(self.record_cls, id_)
         self.require_permission(identity, "read", request=request, **kwargs)
 
         # run components
@@ -169,7 +368,7 @@ class RequestsService(RecordService):
         self, identity, id_, data, revision_id=None, uow=None, expand=False, **kwargs
     ):
         """Update a request."""
-        request = self.record_cls.get_record(id_)
+        request = record_loader.get(self.record_cls, id_)
 
         self.check_revision_id(request, revision_id)
 
@@ -195,7 +394,7 @@ class RequestsService(RecordService):
         # run components
         self.run_components("update", identity, data=data, record=request, uow=uow)
 
-        uow.register(RecordCommitOp(request, indexer=self.indexer))
+        uow.register(RequestCommitOp(request, indexer=self.indexer))
 
         return self.result_item(
             self,
@@ -210,7 +409,7 @@ class RequestsService(RecordService):
     @unit_of_work()
     def delete(self, identity, id_, uow=None, **kwargs):
         """Delete a request from database and search indexes."""
-        request = self.record_cls.get_record(id_)
+        request = record_loader.get(self.record_cls, id_)
 
         # TODO do we need revisions for requests?
         # self.check_revision_id(request, revision_id)
@@ -239,15 +438,27 @@ class RequestsService(RecordService):
 
     @unit_of_work()
     def execute_action(
-        self, identity, id_, action, data=None, uow=None, expand=False, **kwargs
+        self,
+        identity,
+        id_,
+        action,
+        data=None,
+        uow=None,
+        expand=False,
+        refresh=None,
+        **kwargs,
     ):
         """Execute the given action for the request, if possible.
 
         For instance, it would be not possible to execute the specified
         action on the request, if the latter has the wrong status.
+
+        :param refresh: Index refresh mode (``True``, ``"wait_for"`` or
+                        ``False``), defaults to the request type's
+                        ``index_refresh``.
         """
         # Retrieve request and action
-        request = self.record_cls.get_record(id_)
+        request = record_loader.get(self.record_cls, id_)
         action_obj = RequestActions.get_action(request, action)
 
         # Check permissions - example of permission: can_cancel_submitted
@@ -266,9 +477,18 @@ class RequestsService(RecordService):
         if not action_obj.can_execute():
             raise CannotExecuteActionError(action)
 
+        if refresh is None:
+            refresh = request.type.index_refresh
+
         # Execute action and register request for persistence.
         action_obj.execute(identity, uow, **kwargs)
-        uow.register(RecordCommitOp(request, indexer=self.indexer))
+        uow.register(
+            RequestCommitOp(
+                request,
+                indexer=self.indexer,
+                index_refresh="wait_for" if refresh == "wait_for" else False,
+            )
+        )
 
         # Assuming that data is just for comment payload
         if data:
@@ -280,7 +500,8 @@ class RequestsService(RecordService):
             )
 
         # make events immediately available in search
-        uow.register(IndexRefreshOp(indexer=self.indexer))
+        if refresh is True:
+            uow.register(IndexRefreshOp(indexer=self.indexer))
 
         return self.result_item(
             self,
@@ -292,6 +513,141 @@ class RequestsService(RecordService):
             expand=expand,
         )
 
+    def execute_action_many(
+        self, identity, ids, action, data=None, chunk_size=None, refresh=None, **kwargs
+    ):
+        """Execute the given action on many requests.
+
+        The requests are processed in chunks of ``chunk_size`` requests. Each
+        chunk is loaded at once and executed in a single transaction, followed by
+        one bulk index of the affected requests and events, and (depending on
+        ``refresh``) one index refresh. If the execution fails for a request of
+        a chunk, the chunk is rolled back and its requests are executed one by
+        one instead. Indexing errors, which happen after the commit, are only
+        logged: the action is executed, and the requests can be reindexed.
+
+        :param ids: The IDs of the requests.
+        :param action: The name of the action to execute.
+        :param data: Optional comment payload, added to each request.
+        :param chunk_size: Number of requests per transaction (defaults to
+                           ``REQUESTS_BULK_ACTION_CHUNK_SIZE``).
+        :param refresh: Index refresh mode per chunk (``True``, ``"wait_for"``
+                        or ``False``), defaults to the ``index_refresh`` of the
+                        requests' types.
+        :returns: A dict mapping each request ID to ``None`` if the action was
+                  executed, or to the error raised otherwise.
+        """
+        chunk_size = chunk_size or current_app.config["REQUESTS_BULK_ACTION_CHUNK_SIZE"]
+        ids = [str(id_) for id_ in ids]
+
+        results = {}
+        for i in range(0, len(ids), chunk_size):
+            results.update(
+                self._execute_action_chunk(
+                    identity,
+                    ids[i : i + chunk_size],
+                    action,
+                    data=data,
+                    refresh=refresh,
+                    **kwargs,
+                )
+            )
+        return results
+
+    def _execute_action_chunk(
+        self, identity, ids, action, data=None, refresh=None, **kwargs
+    ):
+        """Execute the given action on a chunk of requests, in one transaction."""
+        results = {id_: NoResultFound() for id_ in ids}
+
+        # Retrieve the requests and check which ones the action can be executed on
+        executable = []
+        for request in self.record_cls.get_records(ids):
+            id_ = str(request.id)
+            try:
+                action_obj = RequestActions.get_action(request, action)
+                self.require_permission(
+                    identity,
+                    f"action_{action}",
+                    request=request,
+                    action_obj=action_obj,
+                    data=data,
+                    **kwargs,
+                )
+                if not action_obj.can_execute():
+                    raise CannotExecuteActionError(action)
+            except (
+                CannotExecuteActionError,
+                NoSuchActionError,
+                PermissionDeniedError,
+            ) as e:
+                results[id_] = e
+                continue
+            executable.append((request, action_obj))
+
+        if not executable:
+            return results
+
+        uow = UnitOfWork()
+        try:
+            with uow:
+                # the requests and events are bulk indexed after the commit
+                uow.register(RequestBulkIndexOp(self.indexer, raise_on_error=False))
+                uow.register(
+                    RequestBulkIndexOp(
+                        current_events_service.indexer, raise_on_error=False
+                    )
+                )
+
+                refreshes = []
+                for request, action_obj in executable:
+                    request_refresh = (
+                        refresh if refresh is not None else request.type.index_refresh
+                    )
+                    refreshes.append(request_refresh)
+                    action_obj.execute(identity, uow, **kwargs)
+                    uow.register(
+                        RequestCommitOp(
+                            request,
+                            indexer=self.indexer,
+                            index_refresh=(
+                                "wait_for" if request_refresh == "wait_for" else False
+                            ),
+                        )
+                    )
+                    if data:
+                        _data = dict(payload=data.get("payload", {}))
+                        current_events_service.create(
+                            identity, request.id, _data, CommentEventType, uow=uow
+                        )
+
+                if merge_index_refresh(*refreshes) is True:
+                    uow.register(IndexRefreshOp(indexer=self.indexer))
+                # Only the errors up to the database commit fall back to executing
+                # the action on each request separately, it is executed afterwards.
+                uow.session.commit()
+        except Exception:
+            current_app.logger.warning(
+                f"Failed to execute action '{action}' on a chunk of requests, "
+                "executing it on each request separately.",
+                exc_info=True,
+            )
+            for request, _ in executable:
+                id_ = str(request.id)
+                try:
+                    self.execute_action(
+                        identity, id_, action, data=data, refresh=refresh, **kwargs
+                    )
+                    results[id_] = None
+                except Exception as e:
+                    results[id_] = e
+            return results
+
+        self._commit_chunk(uow, f"the action '{action}' on a chunk of requests")
+        for request, _ in executable:
+            results[str(request.id)] = None
+        return results
+
     def search_user_requests(
         self, identity, params=None, search_preference=None, expand=False, **kwargs
     ):
@@ -333,6 +689,75 @@ class RequestsService(RecordService):
             expand=expand,
         )
 
+    def rebuild_index(self, identity, uow=None, chunk_size=1000):
+        """Reindex all requests.
+
+        The requests are streamed from the database in chunks (paginated by ID),
+        together with their last reply and participants, and sent to the search
+        engine in bulk without going through the indexing queue. The requests
+        which failed to be indexed are logged, without stopping the reindexing.
+
+        Note: Skips (soft) deleted requests.
+
+        :returns: ``True`` if all the requests were indexed, ``False`` otherwise.
+        """
+        _, failed = self._reindex_chunks(chunk_size=chunk_size)
+        if failed:
+            current_app.logger.error(f"Failed to reindex {failed} requests.")
+        return not failed
+
+    def _reindex_chunks(self, chunk_size=1000, before_index=None):
+        """Reindex all requests in chunks (paginated by ID).
+
+        The (non-deleted) requests of each chunk are loaded with their last
+        reply and participants and sent to the search engine in bulk. The
+        objects loaded for each chunk are then removed from the session (along
+        with the records of the loader), so that it does not grow with the
+        number of requests.
+
+        :param before_index: Function called with the IDs of each chunk (deleted
+            requests included) before its requests are loaded and indexed.
+        :returns: Tuple with the number of processed requests and the number of
+            requests which failed to be indexed.
+        """
+        model_cls = self.record_cls.model_cls
+        ids_query = db.session.query(model_cls.id).order_by(model_cls.id)
+
+        last_id = None
+        total = failed = 0
+        while True:
+            query = ids_query
+            if last_id is not None:
+                query = query.filter(model_cls.id > last_id)
+            ids = [row.id for row in query.limit(chunk_size)]
+            if not ids:
+                break
+
+            if before_index is not None:
+                before_index(ids)
+
+            loaded = set(db.session.identity_map.keys())
+            models = (
+                db.session.query(model_cls)
+                .filter(model_cls.id.in_(ids), model_cls.is_deleted == False)  # noqa
+                .options(selectinload(model_cls.participants))
+                .all()
+            )
+            _, chunk_failed = self.indexer.index_records(
+                (self.record_cls(m.data, model=m) for m in models),
+                raise_on_error=False,
+            )
+            for key, obj in list(db.session.identity_map.items()):
+                if key not in loaded:
+                    db.session.expunge(obj)
+            record_loader.clear()
+
+            last_id = ids[-1]
+            total += len(ids)
+            failed += chunk_failed
+
+        return total, failed
+
     @unit_of_work()
     def lock_request(self, identity, id_, uow=None):
         """Lock a request."""
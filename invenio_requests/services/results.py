@@ -4,8 +4,12 @@
 """Request service results."""
 
 from invenio_access.permissions import system_user_id
-from invenio_records_resources.services.records.results import ExpandableField
+from invenio_records_resources.services.records.results import (
+    ExpandableField,
+    MultiFieldsResolver,
+)
 
+from ..cache import expanded_entities_cache
 from ..resolvers.registry import ResolverRegistry
 
 
@@ -19,6 +23,11 @@ class EntityResolverExpandableField(ExpandableField):
 
     entity_proxy = None
 
+    def __init__(self, key):
+        """Initialize the field."""
+        super().__init__(key)
+        self._entity_proxies = {}
+
     def ghost_record(self, value):
         """Return ghost representation of not resolved value."""
         return self.entity_proxy.ghost_record(value)
@@ -33,8 +42,20 @@ class EntityResolverExpandableField(ExpandableField):
         v = self.entity_proxy._parse_ref_dict_id()
         _resolver = self.entity_proxy.get_resolver()
         service = _resolver.get_service()
+        self._entity_proxies[(service, v)] = self.entity_proxy
         return v, service
 
+    def add_dereferenced_record(self, service, value, resolved_rec):
+        """Save the dereferenced record.
+
+        The ghost/system record is built by the entity proxy of the value, rather
+        than the one of the last value collected (which may be of another type).
+        """
+        self.entity_proxy = self._entity_proxies.get(
+            (service, value), self.entity_proxy
+        )
+        super().add_dereferenced_record(service, value, resolved_rec)
+
     def pick(self, identity, resolved_rec):
         """Pick fields defined in the entity resolver."""
         return self.entity_proxy.pick_resolved_fields(identity, resolved_rec)
@@ -101,3 +122,37 @@ class MultiEntityResolverExpandableField(ExpandableField):
         for resolver in ResolverRegistry.get_registered_resolvers():
             if resolver._service_id == service.id:
                 return resolver.type_id
+
+
+class CachedFieldsResolver(MultiFieldsResolver):
+    """Fields resolver sharing the resolved entities within an HTTP request.
+
+    The entities (e.g. users and communities) referenced by the requests and
+    events of an HTTP request or task are resolved once, with one
+    ``read_many`` per service for the entities not resolved yet, even across
+    fields and result lists.
+    """
+
+    @staticmethod
+    def _identity_key(identity):
+        """Key of the identity, as the resolved entities depend on it."""
+        return (identity.id, frozenset(identity.provides))
+
+    def _fetch_referenced(self, grouped_values, identity):
+        """Fetch the referenced records not resolved yet."""
+        identity_key = self._identity_key(identity)
+
+        for service, all_values in grouped_values.items():
+
+            def _read_many(keys, service=service):
+                results = service.read_many(identity, [key[2] for key in keys])
+                hits = {hit.get("id", None): hit for hit in results.hits}
+                # missing values are ghosts
+                return {key: hits.get(key[2]) for key in keys}
+
+            resolved = expanded_entities_cache.get_many(
+                [(service, identity_key, value) for value in all_values], _read_many
+            )
+            for (_, _, value), resolved_rec in resolved.items():
+                for field in self._find_fields(service, value):
+                    field.add_dereferenced_record(service, value, resolved_rec)
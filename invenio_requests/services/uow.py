@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Unit of work operations for requests."""
+
+from collections import Counter
+
+from flask import current_app
+from invenio_records_resources.services.uow import (
+    Operation,
+    RecordCommitOp,
+    RecordDeleteOp,
+)
+
+
+def merge_index_refresh(*refreshes):
+    """Merge index refresh modes, keeping the strongest one.
+
+    ``True`` (refresh immediately) wins over ``"wait_for"`` (wait for the next
+    refresh), which wins over ``False`` (no refresh).
+    """
+    if True in refreshes:
+        return True
+    return "wait_for" if "wait_for" in refreshes else False
+
+
+class RequestCommitOp(RecordCommitOp):
+    """Request commit operation, indexing the request once per unit of work.
+
+    Several operations on a request (e.g. executing an action, which creates log
+    and comment events) register multiple commit/index operations for the same
+    request. Only the last registered operation indexes the request, the
+    previous ones are elided. Indexing is skipped altogether if the request is
+    deleted within the same unit of work, and handed over to the
+    ``RequestBulkIndexOp`` of the request's class if one is registered.
+    """
+
+    def __init__(self, record, indexer=None, index_refresh=False):
+        """Initialize the request commit operation.
+
+        :param index_refresh: ``True``, ``"wait_for"`` or ``False``, see
+                              ``RequestType.index_refresh``.
+        """
+        super().__init__(record, indexer=indexer, index_refresh=index_refresh)
+        self.elided = None
+        """Reason for which the indexing was elided (if it was)."""
+
+    def on_register(self, uow):
+        """Commit request and coalesce with previously registered operations."""
+        super().on_register(uow)
+        self._coalesce(uow)
+
+    def on_commit(self, uow):
+        """Index the request, unless it was elided."""
+        if self.elided is None and self._is_deleted(uow):
+            self.elided = "deleted"
+        if self.elided is None and self._indexer is not None:
+            arguments = {"refresh": self._index_refresh} if self._index_refresh else {}
+            self._indexer.index(self._record, arguments=arguments)
+
+    def _is_same_request(self, op):
+        """Check if the operation is for the same request."""
+        return op is not self and op._record.id == self._record.id
+
+    def _is_deleted(self, uow):
+        """Check if a delete operation is registered for the request."""
+        return any(
+            isinstance(op, RecordDeleteOp) and self._is_same_request(op)
+            for op in uow._operations
+        )
+
+    def _coalesce(self, uow):
+        """Elide the previous index operations for the same request."""
+        if self._indexer is None:
+            return
+
+        bulk_op = None
+        for op in uow._operations:
+            if (
+                isinstance(op, RequestCommitOp)
+                and op.elided is None
+                and op._indexer is not None
+                and self._is_same_request(op)
+            ):
+                # the last registered operation indexes the most recent state
+                op.elided = "duplicate"
+                self._index_refresh = merge_index_refresh(
+                    self._index_refresh, op._index_refresh
+                )
+            elif isinstance(op, RequestBulkIndexOp) and op.accepts(self._record):
+                bulk_op = op
+
+        if bulk_op is not None:
+            bulk_op.add(self._record, index_refresh=self._index_refresh)
+            self.elided = "bulk"
+
+
+class RequestIndexOp(RequestCommitOp):
+    """Request indexing operation, coalesced per unit of work."""
+
+    def on_register(self, uow):
+        """Overwrite method to not commit."""
+        self._coalesce(uow)
+
+
+class RequestEventCommitOp(RequestCommitOp):
+    """Request event commit operation, indexing the event once per unit of work."""
+
+
+class RequestBulkIndexOp(Operation):
+    """Bulk index the requests (or request events) of a unit of work.
+
+    The request commit/index operations registered after this operation hand
+    over their record to it, so that all of them are sent to the search engine
+    in a single bulk request.
+    """
+
+    def __init__(self, indexer, raise_on_error=True):
+        """Initialize the bulk index operation.
+
+        :param indexer: A ``BulkRecordIndexer``, whose ``record_cls`` defines
+                        the records accepted by the operation.
+        :param raise_on_error: If ``False``, indexing errors are logged and
+                               counted in ``failed`` instead of being raised.
+                               Since the records are indexed after the database
+                               commit, this lets the caller tell indexing
+                               failures apart from failed writes.
+        """
+        self._indexer = indexer
+        self._records = {}
+        self._index_refresh = False
+        self._raise_on_error = raise_on_error
+        self.failed = 0
+        """Number of records which could not be indexed."""
+
+    def accepts(self, record):
+        """Check if the record can be bulk indexed by this operation."""
+        return isinstance(record, self._indexer.record_cls)
+
+    def add(self, record, index_refresh=False):
+        """Add a record (replacing a previously added one with the same ID)."""
+        self._records[record.id] = record
+        self._index_refresh = merge_index_refresh(self._index_refresh, index_refresh)
+
+    def on_commit(self, uow):
+        """Bulk index the records, except the deleted ones."""
+        deleted = {
+            op._record.id for op in uow._operations if isinstance(op, RecordDeleteOp)
+        }
+        records = [r for id_, r in self._records.items() if id_ not in deleted]
+        if not records:
+            return
+
+        arguments = {"refresh": self._index_refresh} if self._index_refresh else {}
+        if self._raise_on_error:
+            self._indexer.index_records(records, **arguments)
+            return
+
+        try:
+            _, self.failed = self._indexer.index_records(
+                records, raise_on_error=False, **arguments
+            )
+        except Exception:
+            current_app.logger.exception(
+                f"Failed to bulk index {len(records)} records."
+            )
+            self.failed = len(records)
+        else:
+            if self.failed:
+                current_app.logger.warning(
+                    f"Failed to index {self.failed} of {len(records)} records."
+                )
+
+
+def elided_index_ops(uow):
+    """Count the request index operations elided in a unit of work.
+
+    :returns: A ``Counter`` of the elided operations per reason, i.e.
+              ``"duplicate"``, ``"bulk"`` (handed over to a bulk index
+              operation) or ``"deleted"`` (only known once the unit of work is
+              committed).
+    """
+    return Counter(
+        op.elided
+        for op in uow._operations
+        if isinstance(op, RequestCommitOp) and op.elided is not None
+    )
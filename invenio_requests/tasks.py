@@ -3,23 +3,38 @@
 
 """Celery tasks for requests."""
 
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 
-from celery import shared_task
+from celery import chord, shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_notifications.services.uow import NotificationOp
+from invenio_records_resources.services.uow import UnitOfWork
 from invenio_search.engine import dsl
+from sqlalchemy.exc import NoResultFound
 
 from invenio_requests.proxies import current_user_moderation_service
 from invenio_requests.services.user_moderation.errors import OpenRequestAlreadyExists
 
-from .proxies import current_requests_service
+from .customizations import CommentEventType
+from .proxies import current_events_service, current_requests_service
+from .records.models import RequestParticipantModel, RequestPendingNotificationModel
 
 
 @shared_task
-def check_expired_requests():
-    """Retrieve expired requests and perform expired action."""
+def check_expired_requests(chunk_size=None):
+    """Retrieve expired requests and perform expired action.
+
+    The expired requests are split into chunks of ``chunk_size`` requests
+    (defaults to ``REQUESTS_BULK_ACTION_CHUNK_SIZE``), which are expired in
+    parallel by ``expire_requests`` subtasks. Since expired requests are not
+    open anymore, a run that died halfway resumes where it stopped the next time
+    the task runs.
+    """
     service = current_requests_service
+    chunk_size = chunk_size or current_app.config["REQUESTS_BULK_ACTION_CHUNK_SIZE"]
     now = datetime.now(timezone.utc).isoformat()
 
     # using scan to get all requests
@@ -34,14 +49,59 @@ def check_expired_requests():
             ],
         ),
     )
-    for r in requests_list:
-        try:
-            service.execute_action(
-                identity=system_identity, id_=r["id"], action="expire"
-            )
-        except Exception as e:
-            current_app.logger.warning(e)
-            pass
+    ids = [r["id"] for r in requests_list]
+    if not ids:
+        return
+
+    chunks = [ids[i : i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    chord(expire_requests.si(chunk) for chunk in chunks)(
+        log_expired_requests.s(time.time())
+    )
+
+
+@shared_task(acks_late=True)
+def expire_requests(ids):
+    """Expire a chunk of requests.
+
+    The task is acknowledged once done, so that the chunk is processed again if
+    the worker dies while running it (already expired requests are reported as
+    failures then).
+
+    :returns: The number of expired and failed requests, and the duration.
+    """
+    start = time.time()
+    results = current_requests_service.execute_action_many(
+        system_identity, ids, "expire", chunk_size=len(ids), refresh=False
+    )
+
+    failed = 0
+    for id_, error in results.items():
+        if error is not None:
+            failed += 1
+            current_app.logger.warning(f"Could not expire request {id_}: {error}")
+
+    stats = {
+        "expired": len(results) - failed,
+        "failed": failed,
+        "duration": time.time() - start,
+    }
+    current_app.logger.info(
+        "Expired {expired} requests ({failed} failed) in {duration:.2f}s.".format(
+            **stats
+        )
+    )
+    return stats
+
+
+@shared_task(ignore_result=True)
+def log_expired_requests(chunks_stats, started_at):
+    """Log the metrics of a ``check_expired_requests`` run."""
+    expired = sum(s["expired"] for s in chunks_stats)
+    failed = sum(s["failed"] for s in chunks_stats)
+    current_app.logger.info(
+        f"Expired {expired} requests ({failed} failed) in {len(chunks_stats)} "
+        f"chunks, in {time.time() - started_at:.2f}s."
+    )
 
 
 @shared_task(ignore_result=True)
@@ -59,3 +119,82 @@ def request_moderation(user_id):
         )
     except OpenRequestAlreadyExists as ex:
         current_app.logger.warning(ex.description)
+
+
+@shared_task(ignore_result=True)
+def backfill_participants(chunk_size=1000):
+    """Recompute the denormalized participants of all requests, and reindex them.
+
+    The requests are processed in chunks (paginated by ID), each one in its own
+    transaction, and the (non-deleted) requests of a chunk are sent to the
+    search engine in bulk once their participants are committed.
+
+    :returns: The number of processed requests.
+    """
+
+    def sync_participants(ids):
+        RequestParticipantModel.sync(ids)
+        db.session.commit()
+
+    total, failed = current_requests_service._reindex_chunks(
+        chunk_size=chunk_size, before_index=sync_participants
+    )
+    if failed:
+        current_app.logger.error(f"Failed to reindex {failed} requests.")
+    current_app.logger.info(f"Recomputed the participants of {total} requests.")
+    return total
+
+
+@shared_task(ignore_result=True)
+def send_comment_notifications_digest(key):
+    """Send the pending comment notifications with the given key as one digest.
+
+    The notification is built for the latest of the comments (still existing),
+    so that the recipients are resolved once for all of them. Nothing is sent if
+    the pending notifications were already sent by another task.
+    """
+    with UnitOfWork() as uow:
+        event_ids = RequestPendingNotificationModel.pop(key)
+        events = sorted(
+            (
+                event
+                for event in current_events_service.record_cls.get_records(event_ids)
+                if event.type == CommentEventType
+            ),
+            key=lambda event: event.created,
+        )
+        if events:
+            event = events[-1]
+            try:
+                request = current_requests_service.record_cls.get_record(
+                    event.request_id
+                )
+            except NoResultFound:
+                # the request was deleted in the meantime
+                request = None
+
+            if request is not None:
+                if event.parent_id:
+                    builder = request.type.reply_notification_builder
+                else:
+                    builder = request.type.comment_notification_builder
+                uow.register(
+                    NotificationOp(
+                        builder.build(request, event, digest_size=len(events))
+                    )
+                )
+        uow.commit()
+
+
+@shared_task(ignore_result=True)
+def send_pending_comment_notifications():
+    """Send the digests pending for longer than the digest window.
+
+    The digests are sent by tasks scheduled when they are started, this task
+    sends the ones whose task was lost (e.g. on a worker restart) and should be
+    run periodically. All the pending digests are sent if the window is unset.
+    """
+    window = current_app.config["REQUESTS_COMMENT_NOTIFICATIONS_DIGEST_WINDOW"]
+    before = datetime.now(timezone.utc) - timedelta(seconds=window or 0)
+    for key in RequestPendingNotificationModel.keys_pending_since(before):
+        send_comment_notifications_digest.apply_async(args=(key,))
@@ -386,10 +386,9 @@ def example_request(identity_simple, request_record_input_data, user1, user2):
 def request_with_locking_enabled(
     identity_simple, request_record_input_data, user1, user2, database, app, monkeypatch
 ):
-    """Example request with locking enabled (submitted state) where we clear the schema cache for the dynamic schema to work on config change."""
+    """Example request with locking enabled (submitted state)."""
     monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", True)
     requests_service = current_requests.requests_service
-    current_requests._schema_cache.clear()
     request = requests_service.create(
         identity_simple,
         request_record_input_data,
@@ -6,6 +6,7 @@
 # TODO: This is fully copied from invenio-pages.
 
 from flask import Flask, current_app
+from marshmallow_utils.html import sanitize_html
 
 from invenio_requests import InvenioRequests
 from invenio_requests.config import (
@@ -13,6 +14,7 @@ from invenio_requests.config import (
     REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_TAGS,
 )
 from invenio_requests.customizations.event_types import RequestsCommentsSanitizedHTML
+from invenio_requests.proxies import current_requests
 
 
 def test_extra_allowed_html_tags():
@@ -67,3 +69,30 @@ def test_requests_comments_sanitized_html(app):
         result = sanitizer._deserialize(sample_html, None, None)
 
         assert '<customtag data-custom="value">Test</customtag>' in result
+
+
+def test_requests_comments_sanitizer(app, monkeypatch):
+    """Test the compiled comments sanitizer and its cache."""
+    with app.app_context():
+        sanitizer = current_requests.comments_sanitizer
+        # compiled once, unless the allow-lists are replaced in the config
+        assert current_requests.comments_sanitizer is sanitizer
+        monkeypatch.setitem(
+            app.config, "REQUESTS_COMMENTS_ALLOWED_EXTRA_HTML_TAGS", ["img"]
+        )
+        assert current_requests.comments_sanitizer is not sanitizer
+        sanitizer = current_requests.comments_sanitizer
+
+        # same output as marshmallow-utils' sanitizer
+        for value in [
+            " plain text ",
+            "a < b & c",
+            '<script>alert("x")</script><b onclick="x">bold</b>',
+            "<p>" + "x" * 5000 + "</p>",
+        ]:
+            expected = sanitize_html(value, sanitizer.tags, sanitizer.attrs)
+            assert sanitizer.sanitize(value) == expected
+            assert sanitizer.sanitize(value) == expected
+
+        # only the large value is cached
+        assert len(sanitizer._entries) == 1
@@ -3,11 +3,14 @@
 # SPDX-FileCopyrightText: 2021 TU Wien.
 # SPDX-License-Identifier: MIT
 
+import uuid
+
 import pytest
 from jsonschema import ValidationError
+from sqlalchemy.exc import NoResultFound
 
 from invenio_requests.customizations.event_types import CommentEventType
-from invenio_requests.records import RequestEvent
+from invenio_requests.records import Request, RequestEvent
 
 
 def test_request_event_jsonschema(app, db, example_request):
@@ -28,3 +31,33 @@ def test_request_event_jsonschema(app, db, example_request):
             request_id=example_request.number,
             type=CommentEventType,
         )
+
+
+def test_get_record_with_request(app, db, example_request):
+    comment = RequestEvent.create(
+        {},
+        request=example_request.model,
+        request_id=str(example_request.id),
+        type=CommentEventType,
+    )
+    reply = RequestEvent.create(
+        {},
+        request=example_request.model,
+        request_id=str(example_request.id),
+        type=CommentEventType,
+    )
+    reply.parent_id = str(comment.id)
+    reply.commit()
+    db.session.commit()
+
+    event, request, parent = RequestEvent.get_record_with_request(reply.id)
+    assert event.id == reply.id
+    assert isinstance(request, Request)
+    assert request.id == example_request.id
+    assert parent is None
+
+    _, _, parent = RequestEvent.get_record_with_request(reply.id, with_parent=True)
+    assert parent.id == comment.id
+
+    with pytest.raises(NoResultFound):
+        RequestEvent.get_record_with_request(uuid.uuid4())
@@ -8,6 +8,7 @@ from datetime import timezone
 from helpers import add_comment, add_log_event
 from invenio_access.permissions import system_identity
 
+from invenio_requests.proxies import current_events_service as events_service
 from invenio_requests.proxies import current_requests_service as requests_service
 from invenio_requests.records.api import Request
 
@@ -97,6 +98,30 @@ def test_system_comments_excluded(example_request, user1):
     assert example_request.last_reply.id == original_reply.id
 
 
+def test_last_reply_denormalized(example_request, user1, user2):
+    """Test that the last reply is kept on the request's model."""
+    revision_id = example_request.revision_id
+    comment1 = add_comment(example_request, user1.identity, "First comment")
+    comment2 = add_comment(example_request, user2.identity, "Second comment")
+    example_request = Request.get_record(example_request.id)
+
+    assert example_request.model.last_reply_id == comment2.id
+    assert example_request.model.last_activity_at == comment2.model.created
+    # New activity does not bump the revision of the request
+    assert example_request.revision_id == revision_id
+
+    # Deleting the last reply falls back to the previous comment
+    events_service.delete(user2.identity, comment2.id)
+    example_request = Request.get_record(example_request.id)
+    assert example_request.last_reply.id == comment1.id
+    assert example_request.model.last_activity_at == comment1.model.created
+
+    events_service.delete(user1.identity, comment1.id)
+    example_request = Request.get_record(example_request.id)
+    assert example_request.last_reply is None
+    assert example_request.model.last_activity_at is None
+
+
 def test_search_index_last_reply(example_request, user2, search_clear):
     """Test that last reply object is properly indexed."""
     # Add comment
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the participants tracking system field."""
+
+from unittest import mock
+
+from helpers import add_comment, add_log_event
+from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_notifications.models import Notification
+
+from invenio_requests.notifications.generators import RequestParticipantsRecipient
+from invenio_requests.proxies import current_events_service
+from invenio_requests.proxies import current_requests_service as requests_service
+from invenio_requests.records.api import Request
+from invenio_requests.records.models import RequestParticipantModel
+from invenio_requests.tasks import backfill_participants
+
+
+def test_participants_tracking(example_request, user1, user2):
+    """Test that the event creators are kept on the request."""
+    revision_id = example_request.revision_id
+    assert example_request.participants is None
+
+    add_comment(example_request, user1.identity, "First comment")
+    add_comment(example_request, user2.identity, "Second comment")
+    add_comment(example_request, user1.identity, "Third comment")
+    # System events are excluded
+    add_log_event(example_request, system_identity, "Auto-accepted")
+    example_request = Request.get_record(example_request.id)
+
+    assert example_request.participants == sorted(
+        [str(user1.user.id), str(user2.user.id)]
+    )
+    # New participants do not bump the revision of the request
+    assert example_request.revision_id == revision_id
+
+
+def test_participants_backfill(example_request, user1, user2, search_clear):
+    """Test the backfill of the participants, and their indexing."""
+    add_comment(example_request, user1.identity, "First comment")
+    add_comment(example_request, user2.identity, "Second comment")
+    expected = sorted([str(user1.user.id), str(user2.user.id)])
+
+    RequestParticipantModel.query.delete()
+    db.session.commit()
+    # not backfilled yet
+    assert Request.get_record(example_request.id).participants is None
+
+    assert backfill_participants() == 1
+    assert Request.get_record(example_request.id).participants == expected
+
+    Request.index.refresh()
+    results = requests_service.search(
+        system_identity, params={"q": f"participants:{user2.user.id}"}
+    ).to_dict()
+    assert results["hits"]["total"] == 1
+    # the participants are only indexed, not part of the results
+    assert "participants" not in results["hits"]["hits"][0]
+
+
+def test_participants_recipients(example_request, user1, user2, search_clear):
+    """Test that the participants not backfilled yet are found from the events."""
+    add_comment(example_request, user1.identity, "First comment")
+    request = requests_service.read(system_identity, example_request.id).to_dict()
+    notification = Notification(type="test", context={"request": request})
+    generator = RequestParticipantsRecipient(key="request")
+    expected = {str(user1.user.id), str(user2.user.id)}
+
+    with mock.patch.object(
+        type(current_events_service),
+        "scan",
+        autospec=True,
+        side_effect=type(current_events_service).scan,
+    ) as scan:
+        assert set(generator(notification, {})) == expected
+        assert not scan.called
+
+        RequestParticipantModel.query.delete()
+        db.session.commit()
+        assert set(generator(notification, {})) == expected
+        assert scan.called
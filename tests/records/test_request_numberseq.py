@@ -35,3 +35,11 @@ def test_request_number(app, db):
     RequestNumber.insert(7)
     assert RequestNumber.max() == 11
     assert RequestNumber.next() == 12
+
+
+def test_request_number_many(app, db):
+    """Test reserving a block of values at once."""
+    assert RequestNumber.next() == 1
+    assert RequestNumber.next_many(3) == [2, 3, 4]
+    assert RequestNumber.next_many(0) == []
+    assert RequestNumber.next() == 5
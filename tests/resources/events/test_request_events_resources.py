@@ -6,7 +6,10 @@
 
 import copy
 
+from invenio_db import db
+
 from invenio_requests.customizations.event_types import CommentEventType, LogEventType
+from invenio_requests.proxies import current_events_service
 from invenio_requests.records.api import RequestEvent
 
 
@@ -183,6 +186,99 @@ def test_timeline_links(
     assert expected_links == search_record_links
 
 
+def test_timeline_since(
+    client_logged_as, events_resource_data, example_request, headers
+):
+    """Tests polling the changes of the timeline."""
+    client = client_logged_as("user1@example.org")
+    request_id = example_request.id
+    url = f"/requests/{request_id}/timeline_since"
+
+    # Without a cursor, only the cursor of the current timeline is returned
+    response = client.get(url, headers=headers)
+    assert 200 == response.status_code
+    assert response.json["hits"]["hits"] == []
+    since = response.json["cursors"]["since"]
+    etag = response.headers["ETag"]
+
+    # Nothing changed
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert 304 == response.status_code
+
+    # New comment
+    response = client.post(
+        f"/requests/{request_id}/comments", headers=headers, json=events_resource_data
+    )
+    comment_id = response.json["id"]
+    RequestEvent.index.refresh()
+
+    response = client.get(
+        url, query_string={"since": since}, headers={**headers, "If-None-Match": etag}
+    )
+    assert 200 == response.status_code
+    assert response.headers["ETag"] != etag
+    assert [hit["id"] for hit in response.json["hits"]["hits"]] == [comment_id]
+    since = response.json["cursors"]["since"]
+    etag = response.headers["ETag"]
+
+    # Edited comment
+    data = copy.deepcopy(events_resource_data)
+    data["payload"]["content"] = "Edited comment."
+    client.put(
+        f"/requests/{request_id}/comments/{comment_id}", headers=headers, json=data
+    )
+    RequestEvent.index.refresh()
+
+    response = client.get(
+        url, query_string={"since": since}, headers={**headers, "If-None-Match": etag}
+    )
+    assert 200 == response.status_code
+    hits = response.json["hits"]["hits"]
+    assert [hit["id"] for hit in hits] == [comment_id]
+    assert hits[0]["payload"]["content"] == "Edited comment."
+
+    since = response.json["cursors"]["since"]
+    etag = response.headers["ETag"]
+
+    # New comment, which is not searchable yet
+    event = RequestEvent.create(
+        {},
+        request=example_request.model,
+        request_id=str(request_id),
+        type=CommentEventType,
+    )
+    event.update(copy.deepcopy(events_resource_data))
+    event.created_by = dict(example_request["created_by"])
+    event.commit()
+    db.session.commit()
+
+    response = client.get(
+        url, query_string={"since": since}, headers={**headers, "If-None-Match": etag}
+    )
+    assert 200 == response.status_code
+    assert response.json["hits"]["hits"] == []
+    # the tag is not the one of the database, so that the comment is polled again
+    assert response.headers["ETag"] == etag
+    assert response.json["cursors"]["since"] == since
+
+    current_events_service.indexer.index(event)
+    RequestEvent.index.refresh()
+    response = client.get(
+        url, query_string={"since": since}, headers={**headers, "If-None-Match": etag}
+    )
+    assert 200 == response.status_code
+    assert [hit["id"] for hit in response.json["hits"]["hits"]] == [str(event.id)]
+    etag = response.headers["ETag"]
+
+    # Up to date
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert 304 == response.status_code
+
+    # Invalid cursor
+    response = client.get(url, query_string={"since": "invalid"}, headers=headers)
+    assert 400 == response.status_code
+
+
 def test_empty_comment(
     app, client_logged_as, headers, events_resource_data, example_request
 ):
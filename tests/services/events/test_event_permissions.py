@@ -4,7 +4,10 @@
 
 """Permission tests."""
 
+from unittest import mock
+
 import pytest
+from invenio_records_resources.services import RecordService
 from invenio_records_resources.services.errors import PermissionDeniedError
 
 from invenio_requests.customizations.event_types import CommentEventType, LogEventType
@@ -203,3 +206,47 @@ def test_commenting_on_locked_request(
     results = request_events_service.search(identity_simple_2, request.id)
     assert 3 == results.total  # comment + locked + declined
     # Creation and submission events are not logged because they have log_event=False
+
+
+def test_timeline_permissions_are_batched(
+    app,
+    monkeypatch,
+    identity_simple,
+    identity_simple_2,
+    request_events_service,
+    events_service_data,
+    submit_request,
+):
+    request = submit_request(identity_simple)
+    request_id = request.id
+    comment = events_service_data["comment"]
+
+    for identity in (identity_simple, identity_simple, identity_simple_2):
+        request_events_service.create(identity, request_id, comment, CommentEventType)
+    RequestEvent.index.refresh()
+
+    def _search():
+        with mock.patch.object(
+            type(request_events_service),
+            "check_permission",
+            autospec=True,
+            side_effect=RecordService.check_permission,
+        ) as check_permission:
+            res = request_events_service.search(identity_simple, request_id)
+            hits = [hit for hit in res.hits if hit["type"] == CommentEventType.type_id]
+        return hits, check_permission.call_count
+
+    hits, calls = _search()
+    monkeypatch.setitem(app.config, "REQUESTS_EVENTS_BATCH_PERMISSIONS", True)
+    batched_hits, batched_calls = _search()
+
+    assert [hit["permissions"] for hit in batched_hits] == [
+        hit["permissions"] for hit in hits
+    ]
+    assert [hit["permissions"]["can_update_comment"] for hit in hits] == [
+        True,
+        True,
+        False,
+    ]
+    # one evaluation per permission and distinct commenter
+    assert batched_calls < calls
@@ -6,21 +6,33 @@
 """Service tests."""
 
 import copy
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock
 
 import pytest
 from invenio_access.permissions import system_identity
+from invenio_db import db
 from invenio_notifications.proxies import current_notifications_manager
 from invenio_records_resources.services.records.components import ServiceComponent
+from marshmallow import ValidationError
 
 from invenio_requests.customizations import CommentEventType, LogEventType
 from invenio_requests.customizations.event_types import EventType
-from invenio_requests.errors import RequestEventPermissionError
+from invenio_requests.errors import (
+    NestedChildrenNotAllowedError,
+    RequestEventPermissionError,
+)
 from invenio_requests.notifications.builders import (
     CommentRequestEventCreateNotificationBuilder,
 )
 from invenio_requests.proxies import current_event_type_registry, current_requests
-from invenio_requests.records.api import RequestEvent
+from invenio_requests.records.api import Request, RequestEvent
+from invenio_requests.records.loader import record_loader
+from invenio_requests.records.models import RequestPendingNotificationModel
+from invenio_requests.tasks import (
+    send_comment_notifications_digest,
+    send_pending_comment_notifications,
+)
 
 
 def test_schemas(app, example_request):
@@ -172,6 +184,166 @@ def test_events_are_searchable(
     assert search_log_event["type"] == LogEventType.type_id
 
 
+def test_timeline_cursors(
+    app, identity_simple, events_service_data, create_request, request_events_service
+):
+    """Paginate the timeline with cursors."""
+    request = create_request(identity_simple)
+    request_id = request.id
+    comment = events_service_data["comment"]
+
+    for _ in range(5):
+        request_events_service.create(
+            identity_simple, request_id, comment, CommentEventType
+        )
+    RequestEvent.index.refresh()
+
+    def _ids(result):
+        return [hit["id"] for hit in result.to_dict()["hits"]["hits"]]
+
+    ids = _ids(request_events_service.timeline(identity_simple, request_id, size=10))
+    assert len(ids) == 5
+
+    first = request_events_service.timeline(identity_simple, request_id, size=2)
+    res = first.to_dict()
+    assert _ids(first) == ids[:2]
+    assert res["hits"]["total"] == 5
+    assert res["cursors"]["prev"] is None
+
+    second = request_events_service.timeline(
+        identity_simple, request_id, size=2, cursor=res["cursors"]["next"]
+    )
+    assert _ids(second) == ids[2:4]
+
+    last = request_events_service.timeline(
+        identity_simple, request_id, size=2, cursor=second.to_dict()["cursors"]["next"]
+    )
+    assert _ids(last) == ids[4:]
+    assert last.to_dict()["cursors"]["next"] is None
+
+    # backwards
+    prev = request_events_service.timeline(
+        identity_simple, request_id, size=2, cursor=last.to_dict()["cursors"]["prev"]
+    )
+    assert _ids(prev) == ids[2:4]
+
+    # focus on an event in a single query
+    focused = request_events_service.timeline(
+        identity_simple, request_id, size=2, focus_event_id=ids[3]
+    )
+    assert _ids(focused) == ids[3:5]
+    prev = request_events_service.timeline(
+        identity_simple,
+        request_id,
+        size=2,
+        cursor=focused.to_dict()["cursors"]["prev"],
+    )
+    assert _ids(prev) == ids[1:3]
+
+    with pytest.raises(ValidationError):
+        request_events_service.timeline(
+            identity_simple, request_id, cursor="not-a-cursor"
+        )
+
+
+def test_create_many(
+    app, identity_simple, events_service_data, create_request, request_events_service
+):
+    """Create events in bulk."""
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+    parent = request_events_service.create(
+        identity_simple, request.id, comment, CommentEventType
+    )
+
+    events = [
+        {"data": comment, "event_type": CommentEventType},
+        {"data": comment, "event_type": CommentEventType, "parent_id": parent.id},
+        {"data": comment, "event_type": CommentEventType},
+    ]
+    ids = request_events_service.create_many(identity_simple, request.id, events)
+    RequestEvent.index.refresh()
+
+    assert len(ids) == 3
+    reply = request_events_service.read(identity_simple, ids[1]).to_dict()
+    assert reply["parent_id"] == str(parent.id)
+    assert reply["payload"]["content"] == comment["payload"]["content"]
+    request = current_requests.requests_service.read(identity_simple, request.id)
+    assert request.to_dict()["last_reply"]["id"] == ids[2]
+    replies = request_events_service.get_comment_replies(identity_simple, parent.id)
+    assert [hit["id"] for hit in replies.hits] == [ids[1]]
+
+    # the data of all events is validated before anything is created
+    with pytest.raises(ValidationError) as e:
+        request_events_service.create_many(
+            identity_simple,
+            request.id,
+            [
+                {"data": {"payload": {}}, "event_type": CommentEventType},
+                {"data": comment, "event_type": CommentEventType},
+                {"data": {"payload": {}}, "event_type": CommentEventType},
+            ],
+        )
+    assert set(e.value.messages) == {0, 2}
+
+    with pytest.raises(NestedChildrenNotAllowedError):
+        request_events_service.create_many(
+            identity_simple,
+            request.id,
+            [{"data": comment, "event_type": CommentEventType, "parent_id": ids[1]}],
+        )
+
+
+def test_request_is_loaded_once(
+    app, identity_simple, events_service_data, create_request, request_events_service
+):
+    """The request is loaded once for all the operations on its events."""
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+
+    with app.app_context():
+        item = request_events_service.create(
+            identity_simple, request.id, comment, CommentEventType
+        )
+        data = request_events_service.read(identity_simple, item.id).to_dict()
+        data["payload"]["content"] = "An edited comment"
+        request_events_service.update(identity_simple, item.id, data)
+        current_requests.requests_service.read(identity_simple, request.id)
+
+        assert record_loader.loads == 1
+
+
+def test_loader_rollback(app, identity_simple, create_request):
+    """The records of a rolled back transaction are not reused."""
+    request = create_request(identity_simple)
+
+    with app.app_context():
+        loaded = record_loader.get(Request, request.id)
+        title = loaded["title"]
+        loaded["title"] = "A rolled back title"
+        db.session.rollback()
+
+        reloaded = record_loader.get(Request, request.id)
+        assert reloaded is not loaded
+        assert reloaded["title"] == title
+
+
+def test_loader_commit(app, identity_simple, create_request):
+    """The records are not reused across transactions."""
+    request = create_request(identity_simple)
+
+    with app.app_context():
+        loaded = record_loader.get(Request, request.id)
+        title = loaded["title"]
+        # changed in memory, but never committed
+        loaded["title"] = "An uncommitted title"
+        db.session.commit()
+
+        reloaded = record_loader.get(Request, request.id)
+        assert reloaded is not loaded
+        assert reloaded["title"] == title
+
+
 #
 # invenio-notification testcases
 #
@@ -333,6 +505,101 @@ def test_reply_request_event_notification(
         assert user2.email not in recipients_all
 
 
+def test_thread_participants(
+    app, events_service_data, submit_request, request_events_service, user1, user2
+):
+    """Test the lookup of the authors of a comment thread."""
+    request = submit_request(user2.identity, receiver=user1.user)
+    comment = events_service_data["comment"]
+
+    parent = request_events_service.create(
+        user2.identity, request.id, dict(**comment), CommentEventType
+    )
+    other = request_events_service.create(
+        user1.identity, request.id, dict(**comment), CommentEventType
+    )
+    assert request_events_service.thread_participants(
+        system_identity, request.id, parent.id
+    ) == [str(user2.user.id)]
+
+    for identity in (user1.identity, user2.identity, system_identity):
+        request_events_service.create(
+            identity, request.id, dict(**comment), CommentEventType, parent_id=parent.id
+        )
+
+    # Authors of the parent and of its replies, without the system user
+    assert request_events_service.thread_participants(
+        system_identity, request.id, parent.id
+    ) == sorted([str(user1.user.id), str(user2.user.id)])
+    assert request_events_service.thread_participants(
+        system_identity, request.id, other.id
+    ) == [str(user1.user.id)]
+
+
+def test_comment_notifications_digest(
+    app,
+    events_service_data,
+    submit_request,
+    request_events_service,
+    user1,
+    user2,
+    monkeypatch,
+):
+    """Test that a burst of comments is notified as one digest."""
+    builder = CommentRequestEventCreateNotificationBuilder
+    monkeypatch.setattr(
+        current_notifications_manager,
+        "builders",
+        {**current_notifications_manager.builders, builder.type: builder},
+    )
+    monkeypatch.setitem(
+        app.config, "REQUESTS_COMMENT_NOTIFICATIONS_DIGEST_WINDOW", 5 * 60
+    )
+    # Capture the scheduled digests instead of running them eagerly
+    apply_async = MagicMock()
+    monkeypatch.setattr(send_comment_notifications_digest, "apply_async", apply_async)
+
+    mail = app.extensions.get("mail")
+    request = submit_request(user2.identity, receiver=user1.user)
+    comment = events_service_data["comment"]
+
+    with mail.record_messages() as outbox:
+        for _ in range(3):
+            request_events_service.create(
+                user2.identity, request.id, dict(**comment), CommentEventType
+            )
+        assert len(outbox) == 0
+
+    # All the comments are scheduled in the same digest
+    assert apply_async.call_count == 3
+    assert {call.kwargs["countdown"] for call in apply_async.call_args_list} == {5 * 60}
+    keys = {call.kwargs["args"] for call in apply_async.call_args_list}
+    assert len(keys) == 1
+    (key,) = keys.pop()
+
+    # The sweep only sends the digests pending for longer than the window
+    apply_async.reset_mock()
+    send_pending_comment_notifications()
+    assert apply_async.call_count == 0
+    db.session.query(RequestPendingNotificationModel).update(
+        {"created": datetime.now(timezone.utc) - timedelta(minutes=6)}
+    )
+    db.session.commit()
+    send_pending_comment_notifications()
+    assert [call.kwargs["args"] for call in apply_async.call_args_list] == [(key,)]
+
+    with mail.record_messages() as outbox:
+        send_comment_notifications_digest(key)
+        assert len(outbox) == 1
+        assert outbox[0].recipients == [user1.email]
+        assert "posted 3 comments" in outbox[0].body
+
+        # The following scheduled digests have nothing left to send
+        send_comment_notifications_digest(key)
+        send_comment_notifications_digest(key)
+        assert len(outbox) == 1
+
+
 def _test_comment_request_event_notification(
     app,
     events_service_data,
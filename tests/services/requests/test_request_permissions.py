@@ -5,13 +5,24 @@
 """Permission tests."""
 
 import copy
+from unittest import mock
 
 import pytest
 from invenio_access.permissions import system_identity
+from invenio_records_permissions.generators import IfConfig, SameAs, SystemProcess
 from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_search.engine import dsl
 
+from invenio_requests.customizations import RequestType
 from invenio_requests.errors import CannotExecuteActionError, RequestLockedError
+from invenio_requests.proxies import current_requests
 from invenio_requests.records.api import RequestEventFormat
+from invenio_requests.services.generators import IfLocked, Topic, grant_tokens
+from invenio_requests.services.permissions import (
+    PermissionPolicy,
+    compiled_generators,
+    permission_needs_cache,
+)
 
 
 @pytest.fixture()
@@ -344,3 +355,113 @@ def test_only_system_and_receiver_can_lock_request(
     monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", False)
     with pytest.raises(PermissionDeniedError):
         requests_service.lock_request(system_identity, request.id)
+
+
+def test_topic_query_filter_cache(app, identity_simple):
+    """Test that the topic query filter reuses the excluded request types."""
+    registry = current_requests.request_type_registry
+    topic = Topic()
+
+    query = topic.query_filter(identity=identity_simple)
+    assert topic.query_filter(identity=identity_simple) == query
+    assert query.must[1] is topic.query_filter(identity=identity_simple).must[1]
+    assert grant_tokens(identity_simple, "topic") == grant_tokens(
+        identity_simple, "topic"
+    )
+
+    # registering a new request type invalidates the cached clause
+    class OtherRequestType(RequestType):
+        type_id = "other-request-type"
+
+    registry.register_type(OtherRequestType)
+    try:
+        new_query = topic.query_filter(identity=identity_simple)
+        assert new_query.must[1] is not query.must[1]
+        assert ~dsl.Q("term", type="other-request-type") in new_query.must[1].must
+    finally:
+        registry._registered_types.pop(OtherRequestType.type_id)
+
+
+def test_compiled_permission_generators(app, monkeypatch):
+    """Test that IfConfig and SameAs are resolved in compiled generators."""
+    monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", False)
+    outcomes, generators = compiled_generators(PermissionPolicy, "reply_comment")
+    assert outcomes == (False,)
+    assert generators == compiled_generators(PermissionPolicy, "read")[1]
+    assert not any(isinstance(g, (IfConfig, SameAs)) for g in generators)
+
+    monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", True)
+    outcomes, generators = compiled_generators(PermissionPolicy, "reply_comment")
+    assert outcomes == (True,)
+    assert [type(g) for g in generators] == [IfLocked, SystemProcess]
+    assert generators[0].else_ == compiled_generators(PermissionPolicy, "read")[1]
+
+
+def test_permission_needs_cache(
+    app,
+    identity_simple,
+    identity_simple_2,
+    identity_stranger,
+    requests_service,
+    submit_request,
+):
+    """Test that the needs are cached per request revision."""
+    request = submit_request(identity_simple)
+    permission_needs_cache.clear()
+
+    assert requests_service.check_permission(identity_simple, "read", request=request)
+    assert not requests_service.check_permission(
+        identity_stranger, "read", request=request
+    )
+    assert permission_needs_cache.stats == {"hits": 1, "misses": 1, "size": 1}
+
+    # in-memory changes are evaluated again, even if not committed yet
+    assert requests_service.check_permission(identity_simple_2, "read", request=request)
+    request.status = "created"
+    assert not requests_service.check_permission(
+        identity_simple_2, "read", request=request
+    )
+    request = requests_service.record_cls.get_record(request.id)
+
+    # a new revision of the request is evaluated again
+    requests_service.execute_action(identity_simple, request.id, "cancel")
+    request = requests_service.record_cls.get_record(request.id)
+    assert requests_service.check_permission(identity_simple, "read", request=request)
+    assert permission_needs_cache.stats["misses"] > 1
+
+
+def test_actions_links_evaluator(
+    app,
+    monkeypatch,
+    identity_simple,
+    identity_simple_2,
+    requests_service,
+    submit_request,
+):
+    """Test that the actions links are evaluated once per request signature."""
+    requests = [submit_request(identity_simple) for _ in range(3)]
+
+    def actions_links(identity):
+        links_tpl = requests_service.links_item_tpl
+        return [sorted(links_tpl.expand(identity, r)["actions"]) for r in requests]
+
+    results = {}
+    for enabled in (False, True):
+        monkeypatch.setitem(app.config, "REQUESTS_ACTIONS_BATCH_PERMISSIONS", enabled)
+        with mock.patch.object(
+            PermissionPolicy,
+            "allows",
+            autospec=True,
+            side_effect=PermissionPolicy.allows,
+        ) as allows:
+            results[enabled] = (
+                actions_links(identity_simple),
+                actions_links(identity_simple_2),
+            )
+        results[enabled] += (allows.call_count,)
+
+    creator_links, receiver_links, calls = results[True]
+    assert creator_links == [["cancel"]] * 3
+    assert receiver_links == [["accept", "decline"]] * 3
+    # the same links, with the permissions of the 3 requests evaluated once
+    assert results[False] == (creator_links, receiver_links, calls * 3)
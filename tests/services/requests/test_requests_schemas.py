@@ -29,7 +29,6 @@ def test_load_additional_field(
     app, identity_simple, submit_request, requests_service, monkeypatch
 ):
     monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", True)
-    current_requests._schema_cache.clear()
 
     request = submit_request(identity_simple)
     schema = requests_service._wrap_schema(request.type.marshmallow_schema())
@@ -46,3 +45,24 @@ def test_load_additional_field(
     # This might seem surprising, but it's a side-effect of pre-load cleaning.
     # That the data above has the "is_locked" field because it is marked as load_default=False, is the most important part.
     assert [] == errors
+
+
+def test_schema_registry(app, submit_request, identity_simple, monkeypatch):
+    request_type = submit_request(identity_simple).type
+    registry = current_requests.schema_registry
+
+    monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", False)
+    schema = request_type.marshmallow_schema()
+    assert request_type.marshmallow_schema() is schema
+    assert "is_locked" not in schema().fields
+
+    # the schema depends on the config
+    monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", True)
+    locking_schema = request_type.marshmallow_schema()
+    assert "is_locked" in locking_schema().fields
+
+    registry.clear()
+    assert registry.warm_up(current_requests.request_type_registry) == len(
+        list(current_requests.request_type_registry)
+    )
+    assert request_type.marshmallow_schema() is not locking_schema
@@ -4,11 +4,22 @@
 
 """Service tests."""
 
+from unittest import mock
+
 import pytest
+from invenio_db.uow import UnitOfWork
+from invenio_records_resources.services import EndpointLink
 from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_users_resources.proxies import current_users_service
+from marshmallow import ValidationError
+from sqlalchemy.orm.exc import NoResultFound
 
 from invenio_requests.customizations.event_types import CommentEventType
+from invenio_requests.errors import CannotExecuteActionError
 from invenio_requests.records.api import Request, RequestEvent, RequestEventFormat
+from invenio_requests.services.links import expand_endpoint_link
+from invenio_requests.services.uow import elided_index_ops
+from tests.mock_module.request_type import FakeRequestType
 
 
 def test_submit_request(app, identity_simple, submit_request, request_events_service):
@@ -54,6 +65,266 @@ def test_accept_request(
     assert 3 == results.total  # submit comment + accept event + comment
 
 
+def test_accept_request_indexes_once(
+    app,
+    identity_simple,
+    identity_simple_2,
+    submit_request,
+    requests_service,
+):
+    request = submit_request(identity_simple)
+    data = {
+        "payload": {
+            "content": "Welcome to the community!",
+            "format": RequestEventFormat.HTML.value,
+        }
+    }
+
+    with mock.patch.object(
+        requests_service.indexer, "index", wraps=requests_service.indexer.index
+    ) as index:
+        with UnitOfWork() as uow:
+            requests_service.execute_action(
+                identity_simple_2, request.id, "accept", data, uow=uow
+            )
+            uow.commit()
+
+    # the accept log event and the comment both registered a reindex
+    assert index.call_count == 1
+    assert elided_index_ops(uow) == {"duplicate": 2}
+    hits = requests_service.search(identity_simple).to_dict()["hits"]["hits"]
+    hit = next(h for h in hits if h["id"] == str(request.id))
+    assert hit["status"] == "accepted"
+    assert hit["last_reply"]["payload"]["content"] == "Welcome to the community!"
+
+
+@pytest.mark.parametrize(
+    "refresh,index_arguments,refreshed",
+    [
+        (None, {}, True),
+        ("wait_for", {"refresh": "wait_for"}, False),
+        (False, {}, False),
+    ],
+)
+def test_execute_action_refresh(
+    app,
+    identity_simple,
+    identity_simple_2,
+    submit_request,
+    requests_service,
+    refresh,
+    index_arguments,
+    refreshed,
+):
+    request = submit_request(identity_simple)
+    indexer_cls = requests_service.config.indexer_cls
+
+    with mock.patch.object(indexer_cls, "index", autospec=True) as index:
+        with mock.patch.object(indexer_cls, "refresh", autospec=True) as index_refresh:
+            requests_service.execute_action(
+                identity_simple_2, request.id, "accept", refresh=refresh
+            )
+
+    [request_index_call] = [
+        c for c in index.call_args_list if isinstance(c.args[1], Request)
+    ]
+    assert request_index_call.kwargs["arguments"] == index_arguments
+    assert index_refresh.called == refreshed
+
+
+def test_execute_action_many(
+    app,
+    identity_simple,
+    identity_simple_2,
+    create_request,
+    submit_request,
+    requests_service,
+):
+    submitted = [submit_request(identity_simple) for _ in range(3)]
+    created = create_request(identity_simple)
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    ids = [r.id for r in submitted] + [created.id, missing_id]
+
+    results = requests_service.execute_action_many(
+        identity_simple_2, ids, "accept", chunk_size=2
+    )
+
+    assert [results[str(r.id)] for r in submitted] == [None, None, None]
+    assert isinstance(results[str(created.id)], CannotExecuteActionError)
+    assert isinstance(results[missing_id], NoResultFound)
+
+    Request.index.refresh()
+    hits = requests_service.search(identity_simple).to_dict()["hits"]["hits"]
+    statuses = {h["id"]: h["status"] for h in hits}
+    assert [statuses[str(r.id)] for r in submitted] == ["accepted"] * 3
+    assert statuses[str(created.id)] == "created"
+
+    # the creator is not allowed to accept their own requests
+    results = requests_service.execute_action_many(
+        identity_simple, [created.id], "submit"
+    )
+    assert results == {str(created.id): None}
+    results = requests_service.execute_action_many(
+        identity_simple, [created.id], "accept"
+    )
+    assert isinstance(results[str(created.id)], PermissionDeniedError)
+
+
+@pytest.mark.parametrize("type_refresh,refreshed", [(True, True), (False, False)])
+def test_execute_action_many_refresh(
+    app,
+    identity_simple,
+    identity_simple_2,
+    submit_request,
+    requests_service,
+    monkeypatch,
+    type_refresh,
+    refreshed,
+):
+    """Test that the index refresh defaults to the one of the request's type."""
+    request = submit_request(identity_simple)
+    monkeypatch.setattr(type(request.type), "index_refresh", type_refresh)
+    indexer_cls = requests_service.config.indexer_cls
+
+    with mock.patch.object(indexer_cls, "refresh", autospec=True) as index_refresh:
+        results = requests_service.execute_action_many(
+            identity_simple_2, [request.id], "accept"
+        )
+
+    assert results == {str(request.id): None}
+    assert index_refresh.called == refreshed
+
+
+def test_execute_action_many_index_error(
+    app, identity_simple, identity_simple_2, submit_request, requests_service
+):
+    """Test that indexing errors do not execute the action again."""
+    submitted = [submit_request(identity_simple) for _ in range(2)]
+
+    with mock.patch.object(
+        type(requests_service.indexer),
+        "index_records",
+        side_effect=ConnectionError("search engine unavailable"),
+    ):
+        results = requests_service.execute_action_many(
+            identity_simple_2, [r.id for r in submitted], "accept"
+        )
+
+    # the action succeeded, even if the requests could not be indexed
+    assert results == {str(r.id): None for r in submitted}
+    for request in Request.get_records([r.id for r in submitted]):
+        assert request.status == "accepted"
+
+
+def test_create_many(
+    app, identity_simple, request_record_input_data, requests_service, user1, user2
+):
+    def request_args(title):
+        return dict(
+            data={**request_record_input_data, "title": title},
+            request_type=FakeRequestType,
+            receiver=user2.user,
+            creator=user1.user,
+        )
+
+    invalid = {**request_args("invalid"), "data": {"title": 1}}
+    requests = [request_args("first"), invalid, request_args("second")]
+
+    # in dry-run mode, the requests are only checked
+    results = requests_service.create_many(identity_simple, requests, dry_run=True)
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValidationError)
+    assert Request.model_cls.query.count() == 0
+
+    results = requests_service.create_many(identity_simple, requests, chunk_size=2)
+    assert isinstance(results[1], ValidationError)
+    first, second = Request.get_records([results[0], results[2]])
+    assert first["title"] == "first" and second["title"] == "second"
+    assert first.status == second.status == "created"
+    assert first["receiver"] == {"user": str(user2.id)}
+    assert first.number != second.number
+
+    Request.index.refresh()
+    hits = requests_service.search(identity_simple).to_dict()["hits"]["hits"]
+    assert {h["id"] for h in hits} == {results[0], results[2]}
+
+
+def test_create_many_index_error(
+    app, identity_simple, request_record_input_data, requests_service, user1, user2
+):
+    """Test that indexing errors do not create the requests again."""
+    requests = [
+        dict(
+            data={**request_record_input_data, "title": f"request {i}"},
+            request_type=FakeRequestType,
+            receiver=user2.user,
+            creator=user1.user,
+        )
+        for i in range(3)
+    ]
+
+    with mock.patch.object(
+        type(requests_service.indexer),
+        "index_records",
+        side_effect=ConnectionError("search engine unavailable"),
+    ) as index_records:
+        results = requests_service.create_many(identity_simple, requests)
+
+    assert index_records.called
+    # the requests were created once, and their IDs are returned
+    assert all(isinstance(result, str) for result in results)
+    assert Request.model_cls.query.count() == 3
+    assert {str(r.id) for r in Request.get_records(results)} == set(results)
+
+
+def test_compiled_links(
+    app, identity_simple, submit_request, requests_service, request_events_service
+):
+    """Test that the compiled links are the same as built with url_for."""
+    request = submit_request(identity_simple)
+    comment = request_events_service.create(
+        identity_simple,
+        request.id,
+        {"payload": {"content": "A comment", "format": "html"}},
+        CommentEventType,
+    )
+    event = RequestEvent.get_record(comment.id)
+
+    def expand_links():
+        links_tpl = request_events_service.links_tpl_factory(
+            request_events_service.config.links_item,
+            request=request,
+            request_type=request.type,
+        )
+        return (
+            requests_service.links_item_tpl.expand(identity_simple, request),
+            links_tpl.expand(identity_simple, event),
+        )
+
+    with mock.patch(
+        "invenio_requests.services.links.expand_endpoint_link",
+        side_effect=lambda link, obj, ctx: EndpointLink.expand(link, obj, ctx),
+    ):
+        expected = expand_links()
+
+    request_links, event_links = expand_links()
+    assert (request_links, event_links) == expected
+    assert request_links["actions"]["cancel"].endswith(
+        f"/requests/{request.id}/actions/cancel"
+    )
+    # the link of the request type, with an anchor
+    assert event_links["self_html"].endswith(f"#commentevent-{event.id}")
+
+    # querystring arguments added by the vars of a link are kept
+    def link_vars(obj, vars):
+        vars.update({"id": obj.id, "args": {"tab": "files"}})
+
+    link = EndpointLink("requests.read", params=["id"], vars=link_vars)
+    url = expand_endpoint_link(link, request, {})
+    assert url == EndpointLink.expand(link, request, {})
+    assert url.endswith(f"/requests/{request.id}?tab=files")
+
+
 def test_cancel_request(
     app,
     identity_simple,
@@ -180,6 +451,91 @@ def test_search_user_requests(
     assert str(request_id) not in [h["id"] for h in hits]
 
 
+def test_rebuild_index(
+    app,
+    search,
+    identity_simple,
+    submit_request,
+    requests_service,
+    request_events_service,
+):
+    request = submit_request(identity_simple)
+    comment = request_events_service.create(
+        identity_simple,
+        request.id,
+        {"payload": {"content": "Last reply", "format": "html"}},
+        CommentEventType,
+    )
+    Request.index.refresh()
+    total = requests_service.search(identity_simple).total
+
+    # wipe the index and rebuild it from the database
+    search.delete_by_query(
+        index=Request.index._name, body={"query": {"match_all": {}}}, refresh=True
+    )
+    assert requests_service.search(identity_simple).total == 0
+
+    assert requests_service.rebuild_index(identity_simple, chunk_size=1) is True
+    Request.index.refresh()
+
+    result = requests_service.search(identity_simple)
+    assert result.total == total
+    hits = result.to_dict()["hits"]["hits"]
+    hit = next(h for h in hits if h["id"] == str(request.id))
+    assert hit["last_reply"]["id"] == str(comment.id)
+
+    # the failures are reported
+    with mock.patch.object(
+        type(requests_service.indexer), "index_records", return_value=(0, 1)
+    ):
+        assert requests_service.rebuild_index(identity_simple) is False
+
+
+def test_search_reuses_schema_per_type(
+    app, identity_simple, submit_request, requests_service
+):
+    for _ in range(3):
+        submit_request(identity_simple)
+    Request.index.refresh()
+
+    with mock.patch.object(
+        type(requests_service),
+        "_wrap_schema",
+        autospec=True,
+        side_effect=type(requests_service)._wrap_schema,
+    ) as wrap_schema:
+        hits = requests_service.search(identity_simple).to_dict()["hits"]["hits"]
+
+    assert len(hits) >= 3
+    assert wrap_schema.call_count == len({hit["type"] for hit in hits})
+
+
+def test_search_expansion_is_cached(
+    app, identity_simple, submit_request, requests_service
+):
+    for _ in range(3):
+        submit_request(identity_simple)
+    Request.index.refresh()
+
+    users_service = current_users_service._get_current_object()
+    with mock.patch.object(
+        type(users_service),
+        "read_many",
+        autospec=True,
+        side_effect=type(users_service).read_many,
+    ) as read_many:
+        expanded = [
+            requests_service.search(identity_simple, expand=True).to_dict()
+            for _ in range(2)
+        ]
+
+    # the creators and receivers of all requests are resolved at once, and once
+    assert read_many.call_count == 1
+    assert expanded[0]["hits"]["hits"] == expanded[1]["hits"]["hits"]
+    for hit in expanded[0]["hits"]["hits"]:
+        assert hit["expanded"]["created_by"]["id"] == hit["created_by"]["user"]
+
+
 def test_lock_request(
     app,
     identity_simple_2,
@@ -4,12 +4,13 @@
 """Tasks tests."""
 
 from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 from invenio_access.permissions import system_identity
 from invenio_search.engine import dsl
 
 from invenio_requests.records.api import Request
-from invenio_requests.tasks import check_expired_requests
+from invenio_requests.tasks import check_expired_requests, expire_requests
 
 
 def test_check_expired_requests(
@@ -80,3 +81,22 @@ def test_check_expired_requests(
         ),
     )
     assert request_list.total == 1
+
+
+def test_check_expired_requests_chunks(
+    app, identity_simple, submit_request, requests_service
+):
+    """Test that expired requests are expired in chunks."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    expired = [submit_request(identity_simple, expires_at=now) for _ in range(3)]
+    Request.index.refresh()
+
+    with mock.patch.object(
+        expire_requests, "run", wraps=expire_requests.run
+    ) as expire_chunk:
+        check_expired_requests(chunk_size=2)
+    Request.index.refresh()
+
+    assert expire_chunk.call_count == 2
+    for request in expired:
+        assert requests_service.read(system_identity, request.id)["status"] == "expired"
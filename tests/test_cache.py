@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the request-scoped caches."""
+
+from unittest import mock
+
+from invenio_requests.cache import RequestScopedCache, entity_needs_cache
+
+
+def test_cache_lru(app):
+    """Test the bounded cache and its statistics."""
+    cache = RequestScopedCache("test_lru", maxsize=2)
+    with app.app_context():
+        assert cache.get("a", lambda: 1) == 1
+        assert cache.get("b", lambda: 2) == 2
+        assert cache.get("a", lambda: 3) == 1
+        # "b" is the least recently used entry
+        assert cache.get("c", lambda: 4) == 4
+        assert cache.get("b", lambda: 5) == 5
+        assert cache.stats == {"hits": 1, "misses": 4, "size": 2}
+
+    # the cache is scoped to the application context
+    with app.app_context():
+        assert cache.get("a", lambda: 6) == 6
+        assert cache.stats == {"hits": 0, "misses": 1, "size": 1}
+
+
+def test_cache_ttl(app):
+    """Test the expiration of entries."""
+    cache = RequestScopedCache("test_ttl", ttl=10)
+    with app.app_context():
+        with mock.patch("invenio_requests.cache.time.monotonic", return_value=0):
+            assert cache.get("a", lambda: 1) == 1
+        with mock.patch("invenio_requests.cache.time.monotonic", return_value=5):
+            assert cache.get("a", lambda: 2) == 1
+        with mock.patch("invenio_requests.cache.time.monotonic", return_value=10):
+            assert cache.get("a", lambda: 3) == 3
+
+
+def test_entity_needs_cache(app, example_request):
+    """Test that the needs of an entity are resolved once per app context."""
+    request_type = example_request.type
+    receiver = example_request.receiver
+    with app.app_context():
+        with mock.patch.object(
+            type(receiver), "get_needs", autospec=True, return_value=["need"]
+        ) as get_needs:
+            assert request_type.entity_needs(receiver) == ["need"]
+            assert request_type.entity_needs(receiver) == ["need"]
+        assert get_needs.call_count == 1
+        assert entity_needs_cache.stats == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_get_many(app):
+    """Test that the missing entries are computed in one go."""
+    cache = RequestScopedCache("test_many")
+    factory = mock.Mock(side_effect=lambda keys: {k: k.upper() for k in keys})
+    with app.app_context():
+        assert cache.get_many(["a", "b"], factory) == {"a": "A", "b": "B"}
+        assert cache.get_many(["b", "c", "c"], factory) == {"b": "B", "c": "C"}
+        assert cache.get_many(["a", "c"], factory) == {"a": "A", "c": "C"}
+    assert factory.call_args_list == [mock.call(["a", "b"]), mock.call(["c"])]
@@ -65,3 +65,15 @@ def test_iter():
     assert list(reg) == [TypeA]
     reg.register_type(TypeB)
     assert list(reg) == [TypeA, TypeB]
+
+
+def test_version():
+    """Test that the version changes with the registered types."""
+    reg = TypeRegistry([TypeA])
+    version = reg.version
+
+    reg.register_type(TypeA2)
+    assert reg.version == version
+
+    reg.register_type(TypeA2, force=True)
+    assert reg.version > version